@@ -1,10 +1,13 @@
+import asyncio
 import re
-from collections.abc import Callable, Sequence
+from collections.abc import AsyncGenerator, Awaitable, Callable, Sequence
+from contextlib import AbstractAsyncContextManager, AsyncExitStack
 from inspect import Parameter, Signature
 from typing import Any, Generic, cast
 
 from fastapi import Depends, HTTPException, status
 from makefun import with_signature
+from starlette.requests import HTTPConnection
 
 from fastapi_users import models
 from fastapi_users.authentication.backend import AuthenticationBackend
@@ -14,6 +17,9 @@ from fastapi_users.types import DependencyCallable
 
 INVALID_CHARS_PATTERN = re.compile(r"[^0-9a-zA-Z_]")
 INVALID_LEADING_CHARS_PATTERN = re.compile(r"^[^a-zA-Z_]+")
+CONNECTION_PARAMETER_NAME = "fastapi_users_connection"
+AUTHENTICATION_CACHE_STATE_KEY = "fastapi_users_authentication_cache"
+DEFERRED_USER_MANAGER_PARAMETER_NAME = "fastapi_users_deferred_user_manager"
 
 
 def name_to_variable_name(name: str) -> str:
@@ -35,6 +41,41 @@ class DuplicateBackendNamesError(Exception):
 EnabledBackendsDependency = DependencyCallable[
     Sequence[AuthenticationBackend[models.UP, models.ID]]
 ]
+UserManagerContext = Callable[
+    [], AbstractAsyncContextManager[BaseUserManager[models.UP, models.ID]]
+]
+
+
+class DeferredUserManager(Generic[models.UP, models.ID]):
+    """
+    Handle creating the user manager on first use.
+
+    The user manager context is entered by the first call to `get`
+    and exited with the handle, which is an async context manager.
+
+    :param get_user_manager_context: Callable returning an async context manager
+    yielding the user manager.
+    """
+
+    def __init__(
+        self, get_user_manager_context: UserManagerContext[models.UP, models.ID]
+    ):
+        self.get_user_manager_context = get_user_manager_context
+        self._exit_stack = AsyncExitStack()
+        self._user_manager: BaseUserManager[models.UP, models.ID] | None = None
+
+    async def get(self) -> BaseUserManager[models.UP, models.ID]:
+        if self._user_manager is None:
+            self._user_manager = await self._exit_stack.enter_async_context(
+                self.get_user_manager_context()
+            )
+        return self._user_manager
+
+    async def __aenter__(self) -> "DeferredUserManager[models.UP, models.ID]":
+        return self
+
+    async def __aexit__(self, *exc_info) -> bool | None:
+        return await self._exit_stack.__aexit__(*exc_info)
 
 
 class Authenticator(Generic[models.UP, models.ID]):
@@ -45,8 +86,23 @@ class Authenticator(Generic[models.UP, models.ID]):
     defined by the end-developer. The first backend yielding a user wins.
     If no backend yields a user, an HTTPException is raised.
 
+    The authentication result is cached in the request state,
+    so several dependencies with different requirements
+    only authenticate the user once per request.
+
     :param backends: List of authentication backends.
     :param get_user_manager: User manager dependency callable.
+    :param get_user_manager_context: Optional callable returning an async context
+    manager yielding the user manager. If set, the user manager is only created
+    through it when a token needs to be read by a strategy, and torn down at the end
+    of the request. Otherwise, `get_user_manager` is resolved on each request,
+    even if there is no token.
+    :param concurrent_backends: If `True`, the tokens found by the transports
+    are read concurrently by their strategies. The user of the first backend
+    succeeding in the list order wins, and the remaining reads are cancelled.
+    Make sure your strategies and user manager support concurrent calls before
+    enabling it: for example, a SQLAlchemy session can't be used concurrently.
+    Defaults to `False`.
     """
 
     backends: Sequence[AuthenticationBackend[models.UP, models.ID]]
@@ -55,9 +111,15 @@ class Authenticator(Generic[models.UP, models.ID]):
         self,
         backends: Sequence[AuthenticationBackend[models.UP, models.ID]],
         get_user_manager: UserManagerDependency[models.UP, models.ID],
+        *,
+        get_user_manager_context: UserManagerContext[models.UP, models.ID]
+        | None = None,
+        concurrent_backends: bool = False,
     ):
         self.backends = backends
         self.get_user_manager = get_user_manager
+        self.get_user_manager_context = get_user_manager_context
+        self.concurrent_backends = concurrent_backends
 
     def current_user_token(
         self,
@@ -153,28 +215,45 @@ class Authenticator(Generic[models.UP, models.ID]):
     async def _authenticate(
         self,
         *args,
-        user_manager: BaseUserManager[models.UP, models.ID],
+        user_manager: BaseUserManager[models.UP, models.ID]
+        | DeferredUserManager[models.UP, models.ID]
+        | None = None,
         optional: bool = False,
         active: bool = False,
         verified: bool = False,
         superuser: bool = False,
         **kwargs,
     ) -> tuple[models.UP | None, str | None]:
-        user: models.UP | None = None
-        token: str | None = None
         enabled_backends: Sequence[AuthenticationBackend[models.UP, models.ID]] = (
-            kwargs.get("enabled_backends", self.backends)
+            kwargs.pop("enabled_backends", self.backends)
         )
-        for backend in self.backends:
-            if backend in enabled_backends:
-                token = kwargs[name_to_variable_name(backend.name)]
-                strategy: Strategy[models.UP, models.ID] = kwargs[
-                    name_to_strategy_variable_name(backend.name)
-                ]
-                if token is not None:
-                    user = await strategy.read_token(token, user_manager)
-                    if user:
-                        break
+        connection: HTTPConnection = kwargs.pop(CONNECTION_PARAMETER_NAME)
+        if user_manager is None:
+            user_manager = kwargs.pop(DEFERRED_USER_MANAGER_PARAMETER_NAME)
+
+        cache: dict[tuple, tuple[models.UP | None, str | None]] = getattr(
+            connection.state, AUTHENTICATION_CACHE_STATE_KEY, {}
+        )
+        setattr(connection.state, AUTHENTICATION_CACHE_STATE_KEY, cache)
+        cache_key = tuple(
+            backend for backend in self.backends if backend in enabled_backends
+        )
+        try:
+            user, token = cache[cache_key]
+        except KeyError:
+
+            async def get_strategy(
+                backend: AuthenticationBackend[models.UP, models.ID],
+            ) -> Strategy[models.UP, models.ID]:
+                return kwargs[name_to_strategy_variable_name(backend.name)]
+
+            user, token = await self.read_user_token(
+                cache_key,
+                [kwargs[name_to_variable_name(backend.name)] for backend in cache_key],
+                get_strategy,
+                user_manager,
+            )
+            cache[cache_key] = (user, token)
 
         status_code = status.HTTP_401_UNAUTHORIZED
         if user:
@@ -190,6 +269,92 @@ class Authenticator(Generic[models.UP, models.ID]):
             raise HTTPException(status_code=status_code)
         return user, token
 
+    async def read_user_token(
+        self,
+        backends: Sequence[AuthenticationBackend[models.UP, models.ID]],
+        tokens: Sequence[str | None],
+        get_strategy: Callable[
+            [AuthenticationBackend[models.UP, models.ID]],
+            Awaitable[Strategy[models.UP, models.ID]],
+        ],
+        user_manager: BaseUserManager[models.UP, models.ID]
+        | DeferredUserManager[models.UP, models.ID],
+    ) -> tuple[models.UP | None, str | None]:
+        """
+        Read the tokens found by the transports of the backends.
+
+        The first backend yielding a user wins. If none does, the user is `None`.
+
+        :param backends: List of authentication backends.
+        :param tokens: Token found by the transport of each backend, or `None`.
+        :param get_strategy: Async callable returning the strategy of a backend.
+        It's only called for backends with a token.
+        :param user_manager: The user manager, or a deferred handle to create it.
+        """
+        if self.concurrent_backends:
+            return await self._read_user_token_concurrently(
+                backends, tokens, get_strategy, user_manager
+            )
+
+        user: models.UP | None = None
+        token: str | None = None
+        for backend, token in zip(backends, tokens):
+            if token is not None:
+                strategy = await get_strategy(backend)
+                if isinstance(user_manager, DeferredUserManager):
+                    user_manager = await user_manager.get()
+                user = await strategy.read_token(token, user_manager)
+                if user:
+                    break
+        return user, token
+
+    async def _read_user_token_concurrently(
+        self,
+        backends: Sequence[AuthenticationBackend[models.UP, models.ID]],
+        tokens: Sequence[str | None],
+        get_strategy: Callable[
+            [AuthenticationBackend[models.UP, models.ID]],
+            Awaitable[Strategy[models.UP, models.ID]],
+        ],
+        user_manager: BaseUserManager[models.UP, models.ID]
+        | DeferredUserManager[models.UP, models.ID],
+    ) -> tuple[models.UP | None, str | None]:
+        # Keep the sequential behavior for the returned token if no backend succeeds
+        last_token = tokens[-1] if tokens else None
+
+        reads: list[tuple[str, asyncio.Task[models.UP | None]]] = []
+        try:
+            for backend, token in zip(backends, tokens):
+                if token is None:
+                    continue
+                strategy = await get_strategy(backend)
+                if isinstance(user_manager, DeferredUserManager):
+                    user_manager = await user_manager.get()
+                read = asyncio.ensure_future(strategy.read_token(token, user_manager))
+                reads.append((token, read))
+
+            # Await in order, so the first backend in the list keeps precedence
+            for token, read in reads:
+                user = await read
+                if user:
+                    return user, token
+        finally:
+            for _, read in reads:
+                read.cancel()
+            # Wait for the cancelled reads, so their cleanup runs before returning;
+            # errors of the reads that lost are ignored
+            await asyncio.gather(*(read for _, read in reads), return_exceptions=True)
+
+        return None, last_token
+
+    async def _get_deferred_user_manager(
+        self,
+    ) -> AsyncGenerator[DeferredUserManager[models.UP, models.ID], None]:
+        async with DeferredUserManager(
+            cast(UserManagerContext, self.get_user_manager_context)
+        ) as deferred_user_manager:
+            yield deferred_user_manager
+
     def _get_dependency_signature(
         self, get_enabled_backends: EnabledBackendsDependency | None = None
     ) -> Signature:
@@ -204,25 +369,44 @@ class Authenticator(Generic[models.UP, models.ID]):
         try:
             parameters: list[Parameter] = [
                 Parameter(
-                    name="user_manager",
+                    name=CONNECTION_PARAMETER_NAME,
                     kind=Parameter.POSITIONAL_OR_KEYWORD,
-                    default=Depends(self.get_user_manager),
-                )
+                    annotation=HTTPConnection,
+                ),
             ]
 
+            if self.get_user_manager_context is None:
+                parameters.append(
+                    Parameter(
+                        name="user_manager",
+                        kind=Parameter.POSITIONAL_OR_KEYWORD,
+                        default=Depends(self.get_user_manager),
+                    )
+                )
+            else:
+                parameters.append(
+                    Parameter(
+                        name=DEFERRED_USER_MANAGER_PARAMETER_NAME,
+                        kind=Parameter.POSITIONAL_OR_KEYWORD,
+                        default=Depends(self._get_deferred_user_manager),
+                    )
+                )
+
             for backend in self.backends:
-                parameters += [
+                parameters.append(
                     Parameter(
                         name=name_to_variable_name(backend.name),
                         kind=Parameter.POSITIONAL_OR_KEYWORD,
                         default=Depends(cast(Callable, backend.transport.scheme)),
-                    ),
+                    )
+                )
+                parameters.append(
                     Parameter(
                         name=name_to_strategy_variable_name(backend.name),
                         kind=Parameter.POSITIONAL_OR_KEYWORD,
                         default=Depends(backend.get_strategy),
-                    ),
-                ]
+                    )
+                )
 
             if get_enabled_backends is not None:
                 parameters += [
@@ -0,0 +1,143 @@
+import inspect
+from collections.abc import Callable, Mapping
+from contextlib import AbstractAsyncContextManager, AsyncExitStack
+from typing import Generic, cast
+
+from starlette.requests import HTTPConnection, Request
+from starlette.types import ASGIApp, Receive, Scope, Send
+from starlette.websockets import WebSocket
+
+from fastapi_users import models
+from fastapi_users.authentication.authenticator import (
+    AUTHENTICATION_CACHE_STATE_KEY,
+    Authenticator,
+    DeferredUserManager,
+    UserManagerContext,
+)
+from fastapi_users.authentication.backend import AuthenticationBackend
+from fastapi_users.authentication.strategy import Strategy
+
+StrategyContext = Callable[
+    [], AbstractAsyncContextManager[Strategy[models.UP, models.ID]]
+]
+
+
+class MissingUserManagerContextError(Exception):
+    def __init__(self) -> None:
+        super().__init__(
+            "The middleware needs get_user_manager_context "
+            "to create the user manager outside FastAPI dependencies."
+        )
+
+
+class StrategyDependenciesError(Exception):
+    def __init__(self, backend_name: str) -> None:
+        self.backend_name = backend_name
+        super().__init__(
+            f"The get_strategy callable of the {backend_name} backend has parameters: "
+            "pass a strategy context for it in get_strategy_contexts."
+        )
+
+
+class AuthenticationMiddleware(Generic[models.UP, models.ID]):
+    """
+    ASGI middleware authenticating each request and websocket connection.
+
+    It runs the authentication backends once per connection and stores the
+    authenticated user, or `None`, in `scope["user"]`. This way, it's available
+    in mounted Starlette apps, websocket endpoints or static files routes
+    through `request.user`.
+
+    The result is also reused by the `current_user` dependencies of the
+    authenticator, which then only check the requirements on the user.
+
+    Outside the FastAPI dependency injection system, the middleware creates
+    the strategies and the user manager itself. They are torn down
+    before the request is passed to the app.
+
+    :param app: The ASGI app to wrap.
+    :param authenticator: The authenticator instance,
+    e.g. `fastapi_users.authenticator`.
+    :param get_user_manager_context: Callable returning an async context manager
+    yielding the user manager. Defaults to the one of the authenticator.
+    :param get_strategy_contexts: Optional mapping of backend names to callables
+    returning an async context manager yielding the strategy. It's required
+    for backends whose `get_strategy` has parameters, like dependencies.
+    The other ones are called without arguments.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        authenticator: Authenticator[models.UP, models.ID],
+        get_user_manager_context: UserManagerContext[models.UP, models.ID]
+        | None = None,
+        get_strategy_contexts: Mapping[str, StrategyContext[models.UP, models.ID]]
+        | None = None,
+    ):
+        self.app = app
+        self.authenticator = authenticator
+
+        if get_user_manager_context is None:
+            get_user_manager_context = authenticator.get_user_manager_context
+        if get_user_manager_context is None:
+            raise MissingUserManagerContextError()
+        self.get_user_manager_context = get_user_manager_context
+
+        self.get_strategy_contexts = get_strategy_contexts or {}
+        for backend in authenticator.backends:
+            if (
+                backend.name not in self.get_strategy_contexts
+                and inspect.signature(backend.get_strategy).parameters
+            ):
+                raise StrategyDependenciesError(backend.name)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+
+        connection: HTTPConnection
+        if scope["type"] == "http":
+            connection = Request(scope, receive)
+        else:
+            connection = WebSocket(scope, receive, send)
+
+        backends = self.authenticator.backends
+        # Security schemes only read headers or cookies:
+        # call them directly, so they work for websockets as well
+        tokens: list[str | None] = []
+        for backend in backends:
+            token = cast(Callable, backend.transport.scheme)(connection)
+            if inspect.isawaitable(token):
+                token = await token
+            tokens.append(token)
+
+        async with AsyncExitStack() as exit_stack:
+
+            async def get_strategy(
+                backend: AuthenticationBackend[models.UP, models.ID],
+            ) -> Strategy[models.UP, models.ID]:
+                try:
+                    get_strategy_context = self.get_strategy_contexts[backend.name]
+                except KeyError:
+                    strategy = backend.get_strategy()
+                    if inspect.isawaitable(strategy):
+                        strategy = await strategy
+                    return cast(Strategy[models.UP, models.ID], strategy)
+                return await exit_stack.enter_async_context(get_strategy_context())
+
+            user_manager = await exit_stack.enter_async_context(
+                DeferredUserManager(self.get_user_manager_context)
+            )
+            user, token = await self.authenticator.read_user_token(
+                backends, tokens, get_strategy, user_manager
+            )
+
+        cache_key = tuple(backends)
+        setattr(
+            connection.state, AUTHENTICATION_CACHE_STATE_KEY, {cache_key: (user, token)}
+        )
+        scope["user"] = user
+
+        await self.app(scope, receive, send)
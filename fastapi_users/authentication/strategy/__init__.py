@@ -5,7 +5,9 @@ from fastapi_users.authentication.strategy.base import (
 from fastapi_users.authentication.strategy.db import (
     AP,
     AccessTokenDatabase,
+    AccessTokenLastUsedTracker,
     AccessTokenProtocol,
+    AccessTokenSweeper,
     DatabaseStrategy,
 )
 from fastapi_users.authentication.strategy.jwt import JWTStrategy
@@ -18,7 +20,9 @@ except ImportError:  # pragma: no cover
 __all__ = [
     "AP",
     "AccessTokenDatabase",
+    "AccessTokenLastUsedTracker",
     "AccessTokenProtocol",
+    "AccessTokenSweeper",
     "DatabaseStrategy",
     "JWTStrategy",
     "Strategy",
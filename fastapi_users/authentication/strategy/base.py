@@ -1,6 +1,7 @@
-from typing import Generic, Protocol
+from collections.abc import Sequence
+from typing import Any, Generic, Protocol
 
-from fastapi_users import models
+from fastapi_users import exceptions, models
 from fastapi_users.manager import BaseUserManager
 
 
@@ -13,8 +14,51 @@ class Strategy(Protocol, Generic[models.UP, models.ID]):
         self, token: str | None, user_manager: BaseUserManager[models.UP, models.ID]
     ) -> models.UP | None: ...  # pragma: no cover
 
+    async def read_tokens(
+        self,
+        tokens: Sequence[str],
+        user_manager: BaseUserManager[models.UP, models.ID],
+    ) -> list[models.UP | None]:
+        """
+        Read several tokens at once.
+
+        By default, tokens are read one by one with `read_token`.
+
+        :param tokens: The tokens to read.
+        :param user_manager: The user manager instance.
+        :return: The authenticated users, or `None` for invalid tokens,
+        in the same order as the tokens.
+        """
+        return [await self.read_token(token, user_manager) for token in tokens]
+
     async def write_token(self, user: models.UP) -> str: ...  # pragma: no cover
 
     async def destroy_token(
         self, token: str, user: models.UP
     ) -> None: ...  # pragma: no cover
+
+
+async def get_users_by_ids(
+    user_ids: Sequence[Any | None],
+    user_manager: BaseUserManager[models.UP, models.ID],
+) -> list[models.UP | None]:
+    """
+    Retrieve the users corresponding to a list of raw ids in a single query.
+
+    :param user_ids: The raw ids, as stored in the tokens.
+    :param user_manager: The user manager instance.
+    :return: The users, or `None` for missing or invalid ids,
+    in the same order as the ids.
+    """
+    parsed_ids: list[models.ID | None] = []
+    for user_id in user_ids:
+        try:
+            parsed_ids.append(
+                user_manager.parse_id(user_id) if user_id is not None else None
+            )
+        except exceptions.InvalidID:
+            parsed_ids.append(None)
+
+    users = await user_manager.get_many([id for id in parsed_ids if id is not None])
+    users_iter = iter(users)
+    return [next(users_iter) if id is not None else None for id in parsed_ids]
@@ -1,5 +1,16 @@
 from fastapi_users.authentication.strategy.db.adapter import AccessTokenDatabase
 from fastapi_users.authentication.strategy.db.models import AP, AccessTokenProtocol
 from fastapi_users.authentication.strategy.db.strategy import DatabaseStrategy
+from fastapi_users.authentication.strategy.db.sweeper import AccessTokenSweeper
+from fastapi_users.authentication.strategy.db.tracker import (
+    AccessTokenLastUsedTracker,
+)
 
-__all__ = ["AP", "AccessTokenDatabase", "AccessTokenProtocol", "DatabaseStrategy"]
+__all__ = [
+    "AP",
+    "AccessTokenDatabase",
+    "AccessTokenLastUsedTracker",
+    "AccessTokenProtocol",
+    "AccessTokenSweeper",
+    "DatabaseStrategy",
+]
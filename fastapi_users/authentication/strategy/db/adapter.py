@@ -1,6 +1,8 @@
+from collections.abc import Sequence
 from datetime import datetime
 from typing import Any, Generic, Protocol
 
+from fastapi_users import models
 from fastapi_users.authentication.strategy.db.models import AP
 
 
@@ -13,6 +15,30 @@ class AccessTokenDatabase(Protocol, Generic[AP]):
         """Get a single access token by token."""
         ...  # pragma: no cover
 
+    async def get_by_tokens(
+        self, tokens: Sequence[str], max_age: datetime | None = None
+    ) -> list[AP]:
+        """
+        Get several access tokens by token in a single query.
+
+        Tokens that don't exist or are expired are omitted.
+
+        This method is optional. If the adapter doesn't implement it,
+        the strategy falls back to `get_by_token` for each token.
+        """
+        raise NotImplementedError()
+
+    async def get_user_by_token(
+        self, token: str, max_age: datetime | None = None
+    ) -> models.UserProtocol | None:
+        """
+        Get the user associated to a token in a single query.
+
+        This method is optional. If the adapter doesn't implement it,
+        the strategy falls back to `get_by_token` followed by a user lookup.
+        """
+        raise NotImplementedError()
+
     async def create(self, create_dict: dict[str, Any]) -> AP:
         """Create an access token."""
         ...  # pragma: no cover
@@ -24,3 +50,40 @@ class AccessTokenDatabase(Protocol, Generic[AP]):
     async def delete(self, access_token: AP) -> None:
         """Delete an access token."""
         ...  # pragma: no cover
+
+    async def delete_by_token(self, token: str) -> None:
+        """
+        Delete an access token by token in a single query.
+
+        This method is optional. If the adapter doesn't implement it,
+        the strategy falls back to `get_by_token` followed by `delete`.
+        """
+        raise NotImplementedError()
+
+    async def delete_by_user(self, user_id: Any) -> None:
+        """
+        Delete all the access tokens of a user in a single query.
+
+        This method is optional.
+        """
+        raise NotImplementedError()
+
+    async def delete_expired(self, max_age: datetime, limit: int) -> int:
+        """
+        Delete at most `limit` access tokens created before `max_age`.
+
+        This method is optional. It's required by `AccessTokenSweeper`.
+
+        :return: The number of deleted access tokens.
+        """
+        raise NotImplementedError()
+
+    async def update_last_used(self, last_used: dict[str, datetime]) -> None:
+        """
+        Set the last usage date of several access tokens at once.
+
+        This method is optional. It's required by `AccessTokenLastUsedTracker`.
+
+        :param last_used: Dictionary mapping tokens to their last usage date.
+        """
+        raise NotImplementedError()
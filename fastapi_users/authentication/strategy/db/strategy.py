@@ -1,22 +1,48 @@
+import base64
+import hashlib
 import secrets
+from collections.abc import Sequence
 from datetime import datetime, timedelta, timezone
-from typing import Any, Generic
+from typing import Any, Generic, cast
 
 from fastapi_users import exceptions, models
-from fastapi_users.authentication.strategy.base import Strategy
+from fastapi_users.authentication.strategy.base import (
+    Strategy,
+    StrategyDestroyNotSupportedError,
+    get_users_by_ids,
+)
 from fastapi_users.authentication.strategy.db.adapter import AccessTokenDatabase
 from fastapi_users.authentication.strategy.db.models import AP
+from fastapi_users.authentication.strategy.db.tracker import (
+    AccessTokenLastUsedTracker,
+)
 from fastapi_users.manager import BaseUserManager
 
 
+class DatabaseStrategyDestroyNotSupportedError(StrategyDestroyNotSupportedError):
+    def __init__(self) -> None:
+        message = (
+            "The access token database adapter doesn't implement delete_by_user: "
+            "the tokens of a user can't be revoked at once."
+        )
+        super().__init__(message)
+
+
 class DatabaseStrategy(
     Strategy[models.UP, models.ID], Generic[models.UP, models.ID, AP]
 ):
     def __init__(
-        self, database: AccessTokenDatabase[AP], lifetime_seconds: int | None = None
+        self,
+        database: AccessTokenDatabase[AP],
+        lifetime_seconds: int | None = None,
+        *,
+        hash_tokens: bool = False,
+        last_used_tracker: AccessTokenLastUsedTracker[AP] | None = None,
     ):
         self.database = database
         self.lifetime_seconds = lifetime_seconds
+        self.hash_tokens = hash_tokens
+        self.last_used_tracker = last_used_tracker
 
     async def read_token(
         self, token: str | None, user_manager: BaseUserManager[models.UP, models.ID]
@@ -24,32 +50,132 @@ class DatabaseStrategy(
         if token is None:
             return None
 
-        max_age = None
-        if self.lifetime_seconds:
-            max_age = datetime.now(timezone.utc) - timedelta(
-                seconds=self.lifetime_seconds
-            )
+        token = self._get_stored_token(token)
+        user = await self._get_user_by_token(token, self._get_max_age(), user_manager)
+        if user is not None and self.last_used_tracker is not None:
+            self.last_used_tracker.touch(token)
+        return user
 
-        access_token = await self.database.get_by_token(token, max_age)
-        if access_token is None:
-            return None
+    async def read_tokens(
+        self,
+        tokens: Sequence[str],
+        user_manager: BaseUserManager[models.UP, models.ID],
+    ) -> list[models.UP | None]:
+        max_age = self._get_max_age()
+        stored_tokens = [self._get_stored_token(token) for token in tokens]
 
-        try:
-            parsed_id = user_manager.parse_id(access_token.user_id)
-            return await user_manager.get(parsed_id)
-        except (exceptions.UserNotExists, exceptions.InvalidID):
-            return None
+        access_tokens: list[AP] | None = None
+        get_by_tokens = getattr(self.database, "get_by_tokens", None)
+        if get_by_tokens is not None:
+            try:
+                access_tokens = await get_by_tokens(stored_tokens, max_age)
+            except NotImplementedError:
+                pass
+
+        if access_tokens is None:
+            access_tokens = []
+            for stored_token in stored_tokens:
+                access_token = await self.database.get_by_token(stored_token, max_age)
+                if access_token is not None:
+                    access_tokens.append(access_token)
+
+        user_ids = {
+            access_token.token: access_token.user_id for access_token in access_tokens
+        }
+        users = await get_users_by_ids(
+            [user_ids.get(stored_token) for stored_token in stored_tokens], user_manager
+        )
+
+        if self.last_used_tracker is not None:
+            for stored_token, user in zip(stored_tokens, users):
+                if user is not None:
+                    self.last_used_tracker.touch(stored_token)
+
+        return users
 
     async def write_token(self, user: models.UP) -> str:
         access_token_dict = self._create_access_token_dict(user)
-        access_token = await self.database.create(access_token_dict)
-        return access_token.token
+        token = access_token_dict["token"]
+        access_token_dict["token"] = self._get_stored_token(token)
+        await self.database.create(access_token_dict)
+        return token
 
     async def destroy_token(self, token: str, user: models.UP) -> None:
+        token = self._get_stored_token(token)
+        delete_by_token = getattr(self.database, "delete_by_token", None)
+        if delete_by_token is not None:
+            try:
+                await delete_by_token(token)
+            except NotImplementedError:
+                pass
+            else:
+                return
+
         access_token = await self.database.get_by_token(token)
         if access_token is not None:
             await self.database.delete(access_token)
 
+    async def destroy_user_tokens(self, user: models.UP) -> None:
+        """
+        Revoke all the access tokens of a user.
+
+        Requires the database adapter to implement `delete_by_user`.
+
+        :param user: The user whose tokens should be revoked.
+        :raises DatabaseStrategyDestroyNotSupportedError: The database adapter
+        doesn't implement `delete_by_user`.
+        """
+        delete_by_user = getattr(self.database, "delete_by_user", None)
+        if delete_by_user is None:
+            raise DatabaseStrategyDestroyNotSupportedError()
+        try:
+            await delete_by_user(user.id)
+        except NotImplementedError as e:
+            raise DatabaseStrategyDestroyNotSupportedError() from e
+
+    async def _get_user_by_token(
+        self,
+        token: str,
+        max_age: datetime | None,
+        user_manager: BaseUserManager[models.UP, models.ID],
+    ) -> models.UP | None:
+        # The adapter may follow the protocol structurally, without this method
+        get_user_by_token = getattr(self.database, "get_user_by_token", None)
+        if get_user_by_token is not None:
+            try:
+                user = await get_user_by_token(token, max_age)
+            except NotImplementedError:
+                pass
+            else:
+                return cast(models.UP | None, user)
+
+        access_token = await self.database.get_by_token(token, max_age)
+        if access_token is None:
+            return None
+
+        try:
+            parsed_id = user_manager.parse_id(access_token.user_id)
+            return await user_manager.get(parsed_id)
+        except (exceptions.UserNotExists, exceptions.InvalidID):
+            return None
+
     def _create_access_token_dict(self, user: models.UP) -> dict[str, Any]:
         token = secrets.token_urlsafe()
         return {"token": token, "user_id": user.id}
+
+    def _get_max_age(self) -> datetime | None:
+        if not self.lifetime_seconds:
+            return None
+        return datetime.now(timezone.utc) - timedelta(seconds=self.lifetime_seconds)
+
+    def _get_stored_token(self, token: str) -> str:
+        """
+        Return the value stored in database for a token.
+
+        If `hash_tokens` is enabled, it's the URL-safe base64 encoding of
+        its SHA-256 digest, which has a fixed length of 43 characters.
+        """
+        if not self.hash_tokens:
+            return token
+        digest = hashlib.sha256(token.encode("utf-8")).digest()
+        return base64.urlsafe_b64encode(digest).rstrip(b"=").decode("ascii")
@@ -0,0 +1,85 @@
+import asyncio
+from collections.abc import Callable
+from contextlib import AbstractAsyncContextManager
+from datetime import datetime, timedelta, timezone
+from typing import Generic
+
+from fastapi_users.authentication.strategy.db.adapter import AccessTokenDatabase
+from fastapi_users.authentication.strategy.db.models import AP
+from fastapi_users.background import PeriodicTask
+
+
+class AccessTokenSweeper(PeriodicTask, Generic[AP]):
+    """
+    Periodically delete expired access tokens from the database.
+
+    `DatabaseStrategy` only ignores expired tokens when reading them, so without
+    cleanup, the access tokens table grows forever.
+    Tokens are deleted in bounded batches, to avoid long-running locks.
+
+    Requires the database adapter to implement `delete_expired`.
+
+    :param get_database: Callable returning an async context manager
+    yielding an access token database adapter instance.
+    :param lifetime_seconds: The lifetime of the tokens in seconds.
+    Should be the same as the one of your `DatabaseStrategy`.
+    :param interval: Number of seconds between two sweeps. Defaults to 1 hour.
+    :param jitter: Maximum number of seconds randomly added to the interval.
+    Defaults to 1 minute.
+    :param batch_size: Maximum number of tokens deleted per query.
+    Defaults to 1000.
+    :param batch_delay: Number of seconds to wait between two batches,
+    to limit the load on the database. Defaults to 0.1.
+    :param lock: Optional lock, to avoid several workers sweeping at the same time.
+    See `PeriodicTask`.
+
+    :attribute deleted_count: Total number of deleted tokens since startup.
+    :attribute last_deleted_count: Number of deleted tokens during the last sweep.
+    """
+
+    deleted_count: int
+    last_deleted_count: int
+
+    def __init__(
+        self,
+        get_database: Callable[
+            [], AbstractAsyncContextManager[AccessTokenDatabase[AP]]
+        ],
+        lifetime_seconds: int,
+        *,
+        interval: float = 3600,
+        jitter: float = 60,
+        batch_size: int = 1000,
+        batch_delay: float = 0.1,
+        lock: Callable[[], AbstractAsyncContextManager[bool]] | None = None,
+    ):
+        super().__init__(interval, jitter, lock)
+        self.get_database = get_database
+        self.lifetime_seconds = lifetime_seconds
+        self.batch_size = batch_size
+        self.batch_delay = batch_delay
+        self.deleted_count = 0
+        self.last_deleted_count = 0
+
+    async def run(self) -> None:
+        await self.sweep()
+
+    async def sweep(self) -> int:
+        """
+        Delete all the expired access tokens, batch per batch.
+
+        :return: The number of deleted access tokens.
+        """
+        max_age = datetime.now(timezone.utc) - timedelta(seconds=self.lifetime_seconds)
+        deleted_count = 0
+        async with self.get_database() as database:
+            while True:
+                batch_count = await database.delete_expired(max_age, self.batch_size)
+                deleted_count += batch_count
+                if batch_count < self.batch_size:
+                    break
+                await asyncio.sleep(self.batch_delay)
+
+        self.last_deleted_count = deleted_count
+        self.deleted_count += deleted_count
+        return deleted_count
@@ -0,0 +1,46 @@
+from collections.abc import Callable
+from contextlib import AbstractAsyncContextManager
+from datetime import datetime
+from typing import Generic
+
+from fastapi_users.authentication.strategy.db.adapter import AccessTokenDatabase
+from fastapi_users.authentication.strategy.db.models import AP
+from fastapi_users.background import BufferedBulkWriter
+
+
+class AccessTokenLastUsedTracker(BufferedBulkWriter[str], Generic[AP]):
+    """
+    Track the last usage date of access tokens without writing on each request.
+
+    Token usages are buffered in memory, only keeping the latest date per token,
+    and periodically written to the database in a single bulk update.
+    Pending usages are written when the tracker is stopped.
+
+    Requires the database adapter to implement `update_last_used`.
+
+    :param get_database: Callable returning an async context manager
+    yielding an access token database adapter instance.
+    :param interval: Number of seconds between two writes. Defaults to 60.
+    :param max_size: Maximum number of tokens kept in the buffer.
+    When it's full, usages of new tokens are dropped until the next write.
+    Defaults to 10000.
+
+    :attribute written_count: Total number of written usages since startup.
+    :attribute dropped_count: Total number of dropped usages since startup.
+    """
+
+    def __init__(
+        self,
+        get_database: Callable[
+            [], AbstractAsyncContextManager[AccessTokenDatabase[AP]]
+        ],
+        *,
+        interval: float = 60,
+        max_size: int = 10000,
+    ):
+        super().__init__(self._write_last_used, interval=interval, max_size=max_size)
+        self.get_database = get_database
+
+    async def _write_last_used(self, last_used: dict[str, datetime]) -> None:
+        async with self.get_database() as database:
+            await database.update_last_used(last_used)
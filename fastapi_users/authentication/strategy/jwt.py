@@ -1,4 +1,5 @@
-from typing import Generic
+from collections.abc import Sequence
+from typing import Any, Generic
 
 import jwt
 
@@ -6,6 +7,7 @@ from fastapi_users import exceptions, models
 from fastapi_users.authentication.strategy.base import (
     Strategy,
     StrategyDestroyNotSupportedError,
+    get_users_by_ids,
 )
 from fastapi_users.jwt import SecretType, decode_jwt, generate_jwt
 from fastapi_users.manager import BaseUserManager
@@ -46,14 +48,8 @@ class JWTStrategy(Strategy[models.UP, models.ID], Generic[models.UP, models.ID])
         if token is None:
             return None
 
-        try:
-            data = decode_jwt(
-                token, self.decode_key, self.token_audience, algorithms=[self.algorithm]
-            )
-            user_id = data.get("sub")
-            if user_id is None:
-                return None
-        except jwt.PyJWTError:
+        user_id = self._get_user_id(token)
+        if user_id is None:
             return None
 
         try:
@@ -62,6 +58,14 @@ class JWTStrategy(Strategy[models.UP, models.ID], Generic[models.UP, models.ID])
         except (exceptions.UserNotExists, exceptions.InvalidID):
             return None
 
+    async def read_tokens(
+        self,
+        tokens: Sequence[str],
+        user_manager: BaseUserManager[models.UP, models.ID],
+    ) -> list[models.UP | None]:
+        user_ids = [self._get_user_id(token) for token in tokens]
+        return await get_users_by_ids(user_ids, user_manager)
+
     async def write_token(self, user: models.UP) -> str:
         data = {"sub": str(user.id), "aud": self.token_audience}
         return generate_jwt(
@@ -70,3 +74,12 @@ class JWTStrategy(Strategy[models.UP, models.ID], Generic[models.UP, models.ID])
 
     async def destroy_token(self, token: str, user: models.UP) -> None:
         raise JWTStrategyDestroyNotSupportedError()
+
+    def _get_user_id(self, token: str) -> Any | None:
+        try:
+            data = decode_jwt(
+                token, self.decode_key, self.token_audience, algorithms=[self.algorithm]
+            )
+        except jwt.PyJWTError:
+            return None
+        return data.get("sub")
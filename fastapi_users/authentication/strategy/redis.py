@@ -1,10 +1,11 @@
 import secrets
+from collections.abc import Sequence
 from typing import Generic
 
 import redis.asyncio
 
 from fastapi_users import exceptions, models
-from fastapi_users.authentication.strategy.base import Strategy
+from fastapi_users.authentication.strategy.base import Strategy, get_users_by_ids
 from fastapi_users.manager import BaseUserManager
 
 
@@ -36,6 +37,19 @@ class RedisStrategy(Strategy[models.UP, models.ID], Generic[models.UP, models.ID
         except (exceptions.UserNotExists, exceptions.InvalidID):
             return None
 
+    async def read_tokens(
+        self,
+        tokens: Sequence[str],
+        user_manager: BaseUserManager[models.UP, models.ID],
+    ) -> list[models.UP | None]:
+        if not tokens:
+            return []
+
+        user_ids = await self.redis.mget(
+            [f"{self.key_prefix}{token}" for token in tokens]
+        )
+        return await get_users_by_ids(user_ids, user_manager)
+
     async def write_token(self, user: models.UP) -> str:
         token = secrets.token_urlsafe()
         await self.redis.set(
@@ -0,0 +1,288 @@
+import asyncio
+import logging
+import random
+from collections.abc import Awaitable, Callable, Iterable
+from contextlib import AbstractAsyncContextManager
+from datetime import datetime, timezone
+from typing import Any, Generic, TypeVar
+
+logger = logging.getLogger(__name__)
+
+Hook = Callable[..., Awaitable[Any]]
+KT = TypeVar("KT")
+
+
+class PeriodicTask:
+    """
+    Base class for tasks running periodically in the background.
+
+    It's meant to be started and stopped alongside your application,
+    typically in its lifespan handler:
+
+    ```py
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        async with task:
+            yield
+    ```
+
+    *You should overload the `run` method to implement your own logic.*
+
+    :param interval: Number of seconds between two runs.
+    :param jitter: Maximum number of seconds randomly added to the interval,
+    so several workers don't run the task at the same time. Defaults to 0.
+    :param lock: Optional callable returning an async context manager yielding
+    `True` if the current worker is allowed to run the task,
+    e.g. with an advisory lock. Useful to avoid several workers
+    running the task at the same time.
+    """
+
+    interval: float
+    jitter: float
+
+    def __init__(
+        self,
+        interval: float,
+        jitter: float = 0.0,
+        lock: Callable[[], AbstractAsyncContextManager[bool]] | None = None,
+    ):
+        self.interval = interval
+        self.jitter = jitter
+        self.lock = lock
+        self._task: asyncio.Task | None = None
+
+    async def run(self) -> None:
+        """Perform the work of the task."""
+        raise NotImplementedError()  # pragma: no cover
+
+    async def run_once(self) -> None:
+        """Perform a single run of the task, if the lock is acquired."""
+        if self.lock is None:
+            await self.run()
+            return
+
+        async with self.lock() as acquired:
+            if acquired:
+                await self.run()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        """Start running the task periodically in the background."""
+        if not self.running:
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        """Stop the background loop, waiting for it to terminate."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.wait([self._task])
+            self._task = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.stop()
+
+    async def _loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval + random.uniform(0, self.jitter))
+            try:
+                await self.run_once()
+            except Exception:
+                logger.exception("Error while running %s", type(self).__name__)
+
+
+class BufferedBulkWriter(PeriodicTask, Generic[KT]):
+    """
+    Buffer the latest date of events by key and write them periodically in bulk.
+
+    Events are recorded in memory with `touch`, only keeping the latest date
+    per key, and periodically passed to the `write` callable in a single batch.
+    If a write fails or is cancelled, its batch is kept for the next one.
+    Pending events are written when the task is stopped.
+
+    :param write: Async callable writing a dictionary mapping keys
+    to their latest date, typically in a single bulk update.
+    :param interval: Number of seconds between two writes. Defaults to 60.
+    :param max_size: Maximum number of keys kept in the buffer.
+    When it's full, events of new keys are dropped until the next write.
+    Defaults to 10000.
+
+    :attribute written_count: Total number of written keys since startup.
+    :attribute dropped_count: Total number of dropped events since startup.
+    """
+
+    written_count: int
+    dropped_count: int
+
+    def __init__(
+        self,
+        write: Callable[[dict[KT, datetime]], Awaitable[None]],
+        *,
+        interval: float = 60,
+        max_size: int = 10000,
+    ):
+        super().__init__(interval)
+        self.write = write
+        self.max_size = max_size
+        self.written_count = 0
+        self.dropped_count = 0
+        self._buffer: dict[KT, datetime] = {}
+
+    def touch(self, key: KT) -> None:
+        """
+        Record an event at the current date.
+
+        :param key: The key of the event, e.g. a token or a user id.
+        """
+        if key not in self._buffer and len(self._buffer) >= self.max_size:
+            self.dropped_count += 1
+            return
+        self._buffer[key] = datetime.now(timezone.utc)
+
+    async def run(self) -> None:
+        await self.flush()
+
+    async def flush(self) -> None:
+        """Write the buffered events."""
+        if not self._buffer:
+            return
+
+        batch, self._buffer = self._buffer, {}
+        try:
+            await self.write(batch)
+        except BaseException:
+            # Keep the events for the next write, unless they were touched since.
+            # It includes cancellation, so stop() writes them.
+            for key, date in batch.items():
+                self._buffer.setdefault(key, date)
+            raise
+        self.written_count += len(batch)
+
+    async def stop(self) -> None:
+        await super().stop()
+        await self.flush()
+
+
+class HookDispatcher:
+    """
+    Run user manager hooks in the background, on a pool of workers.
+
+    Selected hooks are put in a queue and the user manager returns immediately,
+    so a slow e-mail or webhook call doesn't delay the response.
+    Other hooks are still awaited inline.
+
+    Like `PeriodicTask`, it's meant to be started and stopped alongside
+    your application. On stop, it waits for the pending hooks to be run.
+    If it's not running, hooks are awaited inline.
+
+    :param hooks: Names of the hooks to run in the background,
+    like `{"on_after_register", "on_after_forgot_password"}`.
+    :param workers: Number of hooks run concurrently. Defaults to 4.
+    :param max_queue_size: Maximum number of pending hooks. When it's reached,
+    triggering a hook waits for a free slot. Defaults to 1000.
+    :param max_retries: Number of retries of a failing hook. Defaults to 3.
+    :param retry_delay: Number of seconds before the first retry,
+    doubled after each failure. Defaults to 1.
+    :param drain_timeout: Maximum number of seconds to wait
+    for the pending hooks on stop. Defaults to 30.
+    """
+
+    def __init__(
+        self,
+        hooks: Iterable[str],
+        *,
+        workers: int = 4,
+        max_queue_size: int = 1000,
+        max_retries: int = 3,
+        retry_delay: float = 1.0,
+        drain_timeout: float = 30.0,
+    ):
+        self.hooks = frozenset(hooks)
+        self.workers = workers
+        self.max_queue_size = max_queue_size
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.drain_timeout = drain_timeout
+        self.processed_count = 0
+        self.failed_count = 0
+        self._queue: asyncio.Queue[tuple[str, Hook, tuple]] = asyncio.Queue(
+            max_queue_size
+        )
+        self._tasks: list[asyncio.Task] = []
+
+    @property
+    def running(self) -> bool:
+        return len(self._tasks) > 0
+
+    @property
+    def pending_count(self) -> int:
+        return self._queue.qsize()
+
+    async def dispatch(self, name: str, hook: Hook, *args: Any) -> None:
+        """
+        Run a hook in the background if it's selected, inline otherwise.
+
+        :param name: Name of the hook.
+        :param hook: The hook to run.
+        :param args: Arguments passed to the hook.
+        """
+        if name in self.hooks and self.running:
+            await self._queue.put((name, hook, args))
+        else:
+            await hook(*args)
+
+    async def start(self) -> None:
+        """Start the workers."""
+        if not self.running:
+            self._queue = asyncio.Queue(self.max_queue_size)
+            self._tasks = [
+                asyncio.create_task(self._work()) for _ in range(self.workers)
+            ]
+
+    async def stop(self) -> None:
+        """Wait for the pending hooks to be run, then stop the workers."""
+        if not self.running:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), self.drain_timeout)
+        except asyncio.TimeoutError:
+            logger.warning("%d hooks were not run before shutdown", self._queue.qsize())
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.wait(self._tasks)
+        self._tasks = []
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.stop()
+
+    async def _work(self) -> None:
+        while True:
+            name, hook, args = await self._queue.get()
+            try:
+                await self._run(name, hook, args)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, name: str, hook: Hook, args: tuple) -> None:
+        for attempt in range(self.max_retries + 1):
+            try:
+                await hook(*args)
+            except Exception:
+                if attempt == self.max_retries:
+                    self.failed_count += 1
+                    logger.exception("Error while running hook %s", name)
+                    return
+                await asyncio.sleep(self.retry_delay * 2**attempt)
+            else:
+                self.processed_count += 1
+                return
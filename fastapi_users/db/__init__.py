@@ -1,6 +1,7 @@
 from fastapi_users.db.base import BaseUserDatabase, UserDatabaseDependency
+from fastapi_users.db.tracker import LastLoginTracker
 
-__all__ = ["BaseUserDatabase", "UserDatabaseDependency"]
+__all__ = ["BaseUserDatabase", "LastLoginTracker", "UserDatabaseDependency"]
 
 
 try:  # pragma: no cover
@@ -1,3 +1,5 @@
+from collections.abc import Sequence
+from datetime import datetime
 from typing import Any, Generic
 
 from fastapi_users.models import ID, OAP, UOAP, UP
@@ -11,10 +13,40 @@ class BaseUserDatabase(Generic[UP, ID]):
         """Get a single user by id."""
         raise NotImplementedError()
 
+    async def get_many(self, ids: Sequence[ID]) -> list[UP]:
+        """
+        Get several users by id.
+
+        Users that don't exist are omitted.
+        By default, users are retrieved one by one with `get`:
+        adapters should override it to retrieve them in a single query.
+        """
+        users: list[UP] = []
+        for id in ids:
+            user = await self.get(id)
+            if user is not None:
+                users.append(user)
+        return users
+
     async def get_by_email(self, email: str) -> UP | None:
         """Get a single user by email."""
         raise NotImplementedError()
 
+    async def get_many_by_email(self, emails: Sequence[str]) -> list[UP]:
+        """
+        Get several users by e-mail.
+
+        Users that don't exist are omitted.
+        By default, users are retrieved one by one with `get_by_email`:
+        adapters should override it to retrieve them in a single query.
+        """
+        users: list[UP] = []
+        for email in emails:
+            user = await self.get_by_email(email)
+            if user is not None:
+                users.append(user)
+        return users
+
     async def get_by_oauth_account(self, oauth: str, account_id: str) -> UP | None:
         """Get a single user by OAuth account id."""
         raise NotImplementedError()
@@ -23,10 +55,54 @@ class BaseUserDatabase(Generic[UP, ID]):
         """Create a user."""
         raise NotImplementedError()
 
+    async def create_unique(self, create_dict: dict[str, Any]) -> UP:
+        """
+        Create a user, relying on the database to enforce e-mail uniqueness.
+
+        It should raise `UserEmailConflict` if a user with the same e-mail
+        already exists, typically by catching the unique constraint violation.
+        E-mails are compared case-insensitively, like `get_by_email` does:
+        the constraint should be case-insensitive as well,
+        e.g. a unique index on `lower(email)`.
+
+        This method is optional. If the adapter doesn't implement it,
+        the user manager checks the e-mail with `get_by_email` before `create`.
+        """
+        raise NotImplementedError()
+
+    async def create_many(self, create_dicts: Sequence[dict[str, Any]]) -> list[UP]:
+        """
+        Create several users in a single query.
+
+        Users are returned in the same order as the dictionaries.
+        It should be atomic: if one of the users can't be created,
+        none of them should be.
+
+        This method is optional. If the adapter doesn't implement it,
+        the importer creates users one by one with `create`.
+        """
+        raise NotImplementedError()
+
     async def update(self, user: UP, update_dict: dict[str, Any]) -> UP:
         """Update a user."""
         raise NotImplementedError()
 
+    async def update_unique(self, user: UP, update_dict: dict[str, Any]) -> UP:
+        """
+        Update a user, relying on the database to enforce e-mail uniqueness.
+
+        It's called instead of `update` when the e-mail of the user changes.
+        It should raise `UserEmailConflict` if another user already has
+        this e-mail, typically by catching the unique constraint violation.
+        E-mails are compared case-insensitively, like `get_by_email` does:
+        the constraint should be case-insensitive as well,
+        e.g. a unique index on `lower(email)`.
+
+        This method is optional. If the adapter doesn't implement it,
+        the user manager checks the e-mail with `get_by_email` before `update`.
+        """
+        raise NotImplementedError()
+
     async def delete(self, user: UP) -> None:
         """Delete a user."""
         raise NotImplementedError()
@@ -46,5 +122,78 @@ class BaseUserDatabase(Generic[UP, ID]):
         """Update an OAuth account on a user."""
         raise NotImplementedError()
 
+    async def upsert_oauth_user(
+        self: "BaseUserDatabase[UOAP, ID]",
+        oauth_account_dict: dict[str, Any],
+        create_dict: dict[str, Any],
+        associate_by_email: bool,
+    ) -> tuple[UOAP, bool]:
+        """
+        Get or create the user of an OAuth account in a single transaction.
+
+        * If a user already has this OAuth account, it's updated
+        with `oauth_account_dict`.
+        * Otherwise, if a user has the same e-mail, the OAuth account is
+        added to it if `associate_by_email` is True. Else, `UserEmailConflict`
+        is raised.
+        * Otherwise, a user is created with `create_dict`
+        and the OAuth account is added to it.
+
+        `create_dict` already contains the hashed password, even if no user
+        is finally created, so the hashing doesn't happen during the transaction.
+
+        This method is optional. If the adapter doesn't implement it,
+        the user manager performs those operations one by one.
+
+        :return: The user and whether it was created.
+        """
+        raise NotImplementedError()
+
+    async def get_expiring_oauth_accounts(
+        self: "BaseUserDatabase[UOAP, ID]",
+        expires_before: int,
+        after: tuple[int, ID] | None,
+        limit: int,
+    ) -> list[tuple[UOAP, OAP]]:
+        """
+        Get the OAuth accounts expiring soon, with their user, using keyset pagination.
+
+        Only accounts with a refresh token are returned, ordered by
+        `expires_at` then by id. An index on `expires_at` is recommended.
+
+        This method is optional. It's required by `OAuthTokenRefresher`.
+
+        :param expires_before: Only return accounts with an `expires_at`
+        timestamp lower than this one.
+        :param after: Only return accounts after this `(expires_at, id)` key,
+        in the same order. If `None`, start from the beginning.
+        :param limit: Maximum number of accounts to return.
+        """
+        raise NotImplementedError()
+
+    async def update_last_login(self, last_logins: dict[ID, datetime]) -> None:
+        """
+        Set the last login date of several users at once.
+
+        This method is optional. It's required by `LastLoginTracker`.
+
+        :param last_logins: Dictionary mapping user ids to their last login date.
+        """
+        raise NotImplementedError()
+
+    async def list(
+        self, after_id: ID | None, limit: int, filters: dict[str, Any]
+    ) -> list[UP]:
+        """
+        List users ordered by id, using keyset pagination.
+
+        :param after_id: Only return users with an id greater than this one.
+        If `None`, start from the beginning.
+        :param limit: Maximum number of users to return.
+        :param filters: Exact values to match on user fields,
+        like `{"is_active": True}`.
+        """
+        raise NotImplementedError()
+
 
 UserDatabaseDependency = DependencyCallable[BaseUserDatabase[UP, ID]]
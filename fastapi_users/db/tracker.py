@@ -0,0 +1,46 @@
+from collections.abc import Callable
+from contextlib import AbstractAsyncContextManager
+from datetime import datetime
+from typing import Generic
+
+from fastapi_users.background import BufferedBulkWriter
+from fastapi_users.db.base import BaseUserDatabase
+from fastapi_users.models import ID, UP
+
+
+class LastLoginTracker(BufferedBulkWriter[ID], Generic[UP, ID]):
+    """
+    Track the last login date of users without writing on each login.
+
+    Logins are buffered in memory, only keeping the latest date per user,
+    and periodically written to the database in a single bulk update.
+    Pending logins are written when the tracker is stopped.
+
+    Requires the database adapter to implement `update_last_login`.
+
+    :param get_database: Callable returning an async context manager
+    yielding a user database adapter instance.
+    :param interval: Number of seconds between two writes. Defaults to 60.
+    :param max_size: Maximum number of users kept in the buffer.
+    When it's full, logins of new users are dropped until the next write.
+    Defaults to 10000.
+
+    :attribute written_count: Total number of written logins since startup.
+    :attribute dropped_count: Total number of dropped logins since startup.
+    """
+
+    def __init__(
+        self,
+        get_database: Callable[
+            [], AbstractAsyncContextManager[BaseUserDatabase[UP, ID]]
+        ],
+        *,
+        interval: float = 60,
+        max_size: int = 10000,
+    ):
+        super().__init__(self._write_last_login, interval=interval, max_size=max_size)
+        self.get_database = get_database
+
+    async def _write_last_login(self, last_logins: dict[ID, datetime]) -> None:
+        async with self.get_database() as database:
+            await database.update_last_login(last_logins)
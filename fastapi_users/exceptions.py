@@ -13,6 +13,10 @@ class UserAlreadyExists(FastAPIUsersException):
     pass
 
 
+class UserEmailConflict(FastAPIUsersException):
+    pass
+
+
 class UserNotExists(FastAPIUsersException):
     pass
 
@@ -36,3 +40,8 @@ class InvalidResetPasswordToken(FastAPIUsersException):
 class InvalidPasswordException(FastAPIUsersException):
     def __init__(self, reason: Any) -> None:
         self.reason = reason
+
+
+class InvalidImportRecord(FastAPIUsersException):
+    def __init__(self, reason: Any) -> None:
+        self.reason = reason
@@ -5,6 +5,7 @@ from fastapi import APIRouter
 
 from fastapi_users import models, schemas
 from fastapi_users.authentication import AuthenticationBackend, Authenticator
+from fastapi_users.authentication.authenticator import UserManagerContext
 from fastapi_users.jwt import SecretType
 from fastapi_users.manager import UserManagerDependency
 from fastapi_users.router import (
@@ -16,6 +17,7 @@ from fastapi_users.router import (
 )
 
 try:
+    from httpx import AsyncClient
     from httpx_oauth.oauth2 import BaseOAuth2
 
     from fastapi_users.router.oauth import (
@@ -24,6 +26,7 @@ try:
         get_oauth_router,
     )
 except ModuleNotFoundError:  # pragma: no cover
+    AsyncClient = type  # type: ignore
     BaseOAuth2 = type  # type: ignore
     CSRF_TOKEN_COOKIE_NAME = ""  # type: ignore
 
@@ -35,6 +38,11 @@ class FastAPIUsers(Generic[models.UP, models.ID]):
     :param get_user_manager: Dependency callable getter to inject the
     user manager class instance.
     :param auth_backends: List of authentication backends.
+    :param get_user_manager_context: Optional callable returning an async context
+    manager yielding the user manager. If set, it's used to create the user manager
+    only when it's needed to authenticate the user.
+    :param concurrent_backends: If `True`, the tokens found by the transports
+    are read concurrently by their strategies. Defaults to `False`.
 
     :attribute current_user: Dependency callable getter to inject authenticated user
     with a specific set of parameters.
@@ -46,8 +54,17 @@ class FastAPIUsers(Generic[models.UP, models.ID]):
         self,
         get_user_manager: UserManagerDependency[models.UP, models.ID],
         auth_backends: Sequence[AuthenticationBackend[models.UP, models.ID]],
+        *,
+        get_user_manager_context: UserManagerContext[models.UP, models.ID]
+        | None = None,
+        concurrent_backends: bool = False,
     ):
-        self.authenticator = Authenticator(auth_backends, get_user_manager)
+        self.authenticator = Authenticator(
+            auth_backends,
+            get_user_manager,
+            get_user_manager_context=get_user_manager_context,
+            concurrent_backends=concurrent_backends,
+        )
         self.get_user_manager = get_user_manager
         self.current_user = self.authenticator.current_user
 
@@ -110,6 +127,7 @@ class FastAPIUsers(Generic[models.UP, models.ID]):
         csrf_token_cookie_secure: bool = True,
         csrf_token_cookie_httponly: bool = True,
         csrf_token_cookie_samesite: Literal["lax", "strict", "none"] = "lax",
+        http_client: AsyncClient | None = None,
     ) -> APIRouter:
         """
         Return an OAuth router for a given OAuth client and authentication backend.
@@ -133,6 +151,9 @@ class FastAPIUsers(Generic[models.UP, models.ID]):
         via JavaScript.
         :param csrf_token_cookie_samesite: A string that specifies the samesite
         strategy for the cookie. Valid values are lax, strict and none. Defaults to lax.
+        :param http_client: Optional HTTPX client reused for all the calls
+        to the OAuth provider, e.g. from `create_oauth_http_client`.
+        By default, a new one is opened for each call.
         """
         return get_oauth_router(
             oauth_client,
@@ -148,6 +169,7 @@ class FastAPIUsers(Generic[models.UP, models.ID]):
             csrf_token_cookie_secure=csrf_token_cookie_secure,
             csrf_token_cookie_httponly=csrf_token_cookie_httponly,
             csrf_token_cookie_samesite=csrf_token_cookie_samesite,
+            http_client=http_client,
         )
 
     def get_oauth_associate_router(
@@ -163,6 +185,7 @@ class FastAPIUsers(Generic[models.UP, models.ID]):
         csrf_token_cookie_secure: bool = True,
         csrf_token_cookie_httponly: bool = True,
         csrf_token_cookie_samesite: Literal["lax", "strict", "none"] = "lax",
+        http_client: AsyncClient | None = None,
     ) -> APIRouter:
         """
         Return an OAuth association router for a given OAuth client.
@@ -183,6 +206,9 @@ class FastAPIUsers(Generic[models.UP, models.ID]):
         via JavaScript.
         :param csrf_token_cookie_samesite: A string that specifies the samesite
         strategy for the cookie. Valid values are lax, strict and none. Defaults to lax.
+        :param http_client: Optional HTTPX client reused for all the calls
+        to the OAuth provider, e.g. from `create_oauth_http_client`.
+        By default, a new one is opened for each call.
         """
         return get_oauth_associate_router(
             oauth_client,
@@ -198,6 +224,7 @@ class FastAPIUsers(Generic[models.UP, models.ID]):
             csrf_token_cookie_secure=csrf_token_cookie_secure,
             csrf_token_cookie_httponly=csrf_token_cookie_httponly,
             csrf_token_cookie_samesite=csrf_token_cookie_samesite,
+            http_client=http_client,
         )
 
     def get_users_router(
@@ -205,6 +232,8 @@ class FastAPIUsers(Generic[models.UP, models.ID]):
         user_schema: type[schemas.U],
         user_update_schema: type[schemas.UU],
         requires_verification: bool = False,
+        enable_list: bool = False,
+        enable_export: bool = False,
     ) -> APIRouter:
         """
         Return a router with routes to manage users.
@@ -213,6 +242,12 @@ class FastAPIUsers(Generic[models.UP, models.ID]):
         :param user_update_schema: Pydantic schema for updating a user.
         :param requires_verification: Whether the endpoints
         require the users to be verified or not. Defaults to False.
+        :param enable_list: Whether to add a superuser route
+        listing the users. It requires the `list` method
+        of the user database adapter. Defaults to False.
+        :param enable_export: Whether to add a superuser route
+        streaming all the users as NDJSON. It requires the `list` method
+        of the user database adapter. Defaults to False.
         """
         return get_users_router(
             self.get_user_manager,
@@ -220,4 +255,6 @@ class FastAPIUsers(Generic[models.UP, models.ID]):
             user_update_schema,
             self.authenticator,
             requires_verification,
+            enable_list,
+            enable_export,
         )
@@ -0,0 +1,324 @@
+import argparse
+import asyncio
+import contextlib
+import dataclasses
+import importlib
+import json
+import sys
+from collections.abc import (
+    AsyncGenerator,
+    AsyncIterable,
+    Callable,
+    Iterable,
+    Mapping,
+    Sequence,
+)
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Generic
+
+from fastapi_users import exceptions, models
+from fastapi_users.manager import BaseUserManager, _implements
+
+
+@dataclasses.dataclass
+class UserImportResult(Generic[models.UP]):
+    """
+    Result of the import of a single record.
+
+    :param index: Position of the record in the input stream.
+    :param email: E-mail of the record, if any.
+    :param user: The created user, if the import succeeded.
+    :param error: The exception which prevented the import, if it failed.
+    """
+
+    index: int
+    email: str | None
+    user: models.UP | None = None
+    error: Exception | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclasses.dataclass
+class _PendingRecord:
+    index: int
+    email: str
+    user_dict: dict[str, Any]
+    password: str | None = None
+
+
+class UserImporter(Generic[models.UP, models.ID]):
+    """
+    Import users in bulk from a stream of records.
+
+    Each record is a mapping with an `email`, either a plaintext `password`
+    or a `hashed_password`, and any other field of your user model.
+
+    Records are processed by batches: for each batch, e-mails are checked
+    against the database with a single query, plaintext passwords are hashed
+    in parallel in an executor and users are inserted with the `create_many`
+    method of the user database. If it's not implemented, users are created
+    one by one with `create`. Database errors are not caught: they abort the import.
+
+    Pre-hashed passwords must have a format supported by the password helper
+    of the user manager, like Argon2 or Bcrypt with the default one.
+
+    *The `on_after_register` handler is not triggered and passwords
+    are not validated: imported users are not new registrations.*
+
+    :param user_manager: The user manager instance.
+    :param batch_size: Number of records processed at once. Defaults to 500.
+    :param executor: Executor used to hash the passwords.
+    Defaults to `None`, which uses the default executor of the event loop.
+    """
+
+    def __init__(
+        self,
+        user_manager: BaseUserManager[models.UP, models.ID],
+        *,
+        batch_size: int = 500,
+        executor: Executor | None = None,
+    ):
+        self.user_manager = user_manager
+        self.batch_size = batch_size
+        self.executor = executor
+
+    async def import_users(
+        self, records: Iterable[Mapping[str, Any]] | AsyncIterable[Mapping[str, Any]]
+    ) -> AsyncGenerator[UserImportResult[models.UP], None]:
+        """
+        Import users from a stream of records.
+
+        An invalid record doesn't stop the import: its error is reported
+        in the corresponding result. A database error does.
+
+        :param records: An iterable or async iterable of records.
+        :return: An async generator of results, in the same order as the records.
+        """
+        batch: list[tuple[int, Mapping[str, Any]]] = []
+        index = 0
+        async for record in _aiter(records):
+            batch.append((index, record))
+            index += 1
+            if len(batch) >= self.batch_size:
+                for result in await self._import_batch(batch):
+                    yield result
+                batch = []
+        if batch:
+            for result in await self._import_batch(batch):
+                yield result
+
+    async def _import_batch(
+        self, batch: Sequence[tuple[int, Mapping[str, Any]]]
+    ) -> list[UserImportResult[models.UP]]:
+        results: dict[int, UserImportResult[models.UP]] = {}
+        pending: dict[str, _PendingRecord] = {}
+
+        for index, record in batch:
+            try:
+                pending_record = self._parse_record(index, record)
+            except exceptions.FastAPIUsersException as e:
+                email = record.get("email") if isinstance(record, Mapping) else None
+                results[index] = UserImportResult(
+                    index, email if isinstance(email, str) else None, error=e
+                )
+                continue
+
+            key = pending_record.email.lower()
+            if key in pending:
+                results[index] = UserImportResult(
+                    index,
+                    pending_record.email,
+                    error=exceptions.UserAlreadyExists(),
+                )
+            else:
+                pending[key] = pending_record
+
+        existing_users = await self.user_manager.get_many_by_email(
+            [pending_record.email for pending_record in pending.values()]
+        )
+        for pending_record, existing_user in zip(
+            list(pending.values()), existing_users
+        ):
+            if existing_user is not None:
+                del pending[pending_record.email.lower()]
+                results[pending_record.index] = UserImportResult(
+                    pending_record.index,
+                    pending_record.email,
+                    error=exceptions.UserAlreadyExists(),
+                )
+
+        to_create = list(pending.values())
+        await self._hash_passwords(to_create)
+        users = await self._create_users(to_create)
+
+        for pending_record, user in zip(to_create, users):
+            results[pending_record.index] = UserImportResult(
+                pending_record.index, pending_record.email, user=user
+            )
+
+        return [results[index] for index, _ in batch]
+
+    def _parse_record(self, index: int, record: Mapping[str, Any]) -> _PendingRecord:
+        if not isinstance(record, Mapping):
+            raise exceptions.InvalidImportRecord(reason="Record is not a mapping.")
+        user_dict = dict(record)
+
+        email = user_dict.get("email")
+        if not isinstance(email, str) or not email:
+            raise exceptions.InvalidImportRecord(reason="Missing e-mail.")
+
+        password = user_dict.pop("password", None)
+        hashed_password = user_dict.get("hashed_password")
+        if (password is None) == (hashed_password is None):
+            raise exceptions.InvalidImportRecord(
+                reason="Exactly one of password or hashed_password is required."
+            )
+
+        if hashed_password is not None and not (
+            self.user_manager.password_helper.identify(hashed_password)
+        ):
+            raise exceptions.InvalidImportRecord(
+                reason="Unsupported password hash format."
+            )
+
+        return _PendingRecord(index, email, user_dict, password)
+
+    async def _hash_passwords(self, pending_records: Sequence[_PendingRecord]) -> None:
+        loop = asyncio.get_running_loop()
+        to_hash = [
+            (pending_record, pending_record.password)
+            for pending_record in pending_records
+            if pending_record.password is not None
+        ]
+        hashed_passwords = await asyncio.gather(
+            *(
+                loop.run_in_executor(
+                    self.executor, self.user_manager.password_helper.hash, password
+                )
+                for _, password in to_hash
+            )
+        )
+        for (pending_record, _), hashed_password in zip(to_hash, hashed_passwords):
+            pending_record.user_dict["hashed_password"] = hashed_password
+
+    async def _create_users(
+        self, pending_records: Sequence[_PendingRecord]
+    ) -> list[models.UP]:
+        if not pending_records:
+            return []
+
+        user_db = self.user_manager.user_db
+        create_dicts = [pending_record.user_dict for pending_record in pending_records]
+        if _implements(user_db, "create_many"):
+            return list(await user_db.create_many(create_dicts))
+        return [await user_db.create(create_dict) for create_dict in create_dicts]
+
+
+async def _aiter(
+    records: Iterable[Mapping[str, Any]] | AsyncIterable[Mapping[str, Any]],
+) -> AsyncGenerator[Mapping[str, Any], None]:
+    if isinstance(records, AsyncIterable):
+        async for record in records:
+            yield record
+    else:
+        for record in records:
+            yield record
+
+
+def _load_object(path: str) -> Any:
+    module_name, _, attribute = path.partition(":")
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+def _read_records(lines: Iterable[str]) -> Iterable[Any]:
+    for line in lines:
+        if line.strip():
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                # Let the importer reject it, instead of aborting the import
+                yield line
+
+
+async def _run(
+    get_user_manager_context: Callable[
+        [], contextlib.AbstractAsyncContextManager[BaseUserManager]
+    ],
+    lines: Iterable[str],
+    batch_size: int,
+    workers: int | None,
+) -> tuple[int, int]:
+    imported, failed = 0, 0
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        async with get_user_manager_context() as user_manager:
+            importer = UserImporter(
+                user_manager, batch_size=batch_size, executor=executor
+            )
+            async for result in importer.import_users(_read_records(lines)):
+                if result.ok:
+                    imported += 1
+                    continue
+                failed += 1
+                error = {
+                    "index": result.index,
+                    "email": result.email,
+                    "error": type(result.error).__name__,
+                }
+                reason = getattr(result.error, "reason", None)
+                if reason is not None:
+                    error["reason"] = reason
+                print(json.dumps(error))
+    return imported, failed
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """
+    Import users from a NDJSON file, one record per line.
+
+    Errors are printed to the standard output as NDJSON.
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m fastapi_users.importer",
+        description="Import users in bulk from a NDJSON file, one record per line.",
+    )
+    parser.add_argument(
+        "user_manager",
+        help=(
+            "Path to a callable returning an async context manager "
+            "yielding the user manager, like 'app.users:get_user_manager_context'."
+        ),
+    )
+    parser.add_argument(
+        "file",
+        type=argparse.FileType("r"),
+        help="NDJSON file to import. Use '-' to read from the standard input.",
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=500, help="Records processed at once."
+    )
+    parser.add_argument(
+        "--workers", type=int, default=None, help="Threads used to hash passwords."
+    )
+    args = parser.parse_args(argv)
+    if ":" not in args.user_manager:
+        parser.error("user_manager should be a path like 'module:attribute'.")
+
+    with args.file:
+        imported, failed = asyncio.run(
+            _run(
+                _load_object(args.user_manager),
+                args.file,
+                args.batch_size,
+                args.workers,
+            )
+        )
+
+    print(f"{imported} users imported, {failed} failed.", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
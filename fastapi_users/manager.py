@@ -1,4 +1,5 @@
 import uuid
+from collections.abc import AsyncGenerator, Sequence
 from typing import Any, Generic
 
 import jwt
@@ -6,14 +7,26 @@ from fastapi import Request, Response
 from fastapi.security import OAuth2PasswordRequestForm
 
 from fastapi_users import exceptions, models, schemas
-from fastapi_users.db import BaseUserDatabase
+from fastapi_users.background import HookDispatcher
+from fastapi_users.db import BaseUserDatabase, LastLoginTracker
 from fastapi_users.jwt import SecretType, decode_jwt, generate_jwt
+from fastapi_users.outbox import OutboxDatabase, UserEventType
 from fastapi_users.password import PasswordHelper, PasswordHelperProtocol
 from fastapi_users.types import DependencyCallable
 
 RESET_PASSWORD_TOKEN_AUDIENCE = "fastapi-users:reset"
 VERIFY_USER_TOKEN_AUDIENCE = "fastapi-users:verify"
 
+_MISSING = object()
+
+
+def _implements(user_db: BaseUserDatabase, method: str) -> bool:
+    """Whether the database adapter implements an optional method."""
+    implementation = getattr(user_db, method, None)
+    return implementation is not None and getattr(
+        implementation, "__func__", None
+    ) is not getattr(BaseUserDatabase, method)
+
 
 class BaseUserManager(Generic[models.UP, models.ID]):
     """
@@ -25,8 +38,18 @@ class BaseUserManager(Generic[models.UP, models.ID]):
     :attribute verification_token_secret: Secret to encode verification token.
     :attribute verification_token_lifetime_seconds: Lifetime of verification token.
     :attribute verification_token_audience: JWT audience of verification token.
+    :attribute hook_dispatcher: Optional hook dispatcher,
+    to run some hooks in the background.
+    :attribute last_login_tracker: Optional last login tracker,
+    to record the last login date of users with periodic bulk writes.
 
     :param user_db: Database adapter instance.
+    :param password_helper: Optional password helper instance.
+    :param outbox_db: Optional outbox database adapter instance.
+    If set, lifecycle events are recorded right after the user writes,
+    to be delivered by an `OutboxRelay`. It's not transactional:
+    if recording an event fails, the exception is raised
+    after the user write was committed, and the `on_after_*` handler is not called.
     """
 
     reset_password_token_secret: SecretType
@@ -37,15 +60,21 @@ class BaseUserManager(Generic[models.UP, models.ID]):
     verification_token_lifetime_seconds: int = 3600
     verification_token_audience: str = VERIFY_USER_TOKEN_AUDIENCE
 
+    hook_dispatcher: HookDispatcher | None = None
+    last_login_tracker: LastLoginTracker | None = None
+
     user_db: BaseUserDatabase[models.UP, models.ID]
     password_helper: PasswordHelperProtocol
+    outbox_db: OutboxDatabase | None
 
     def __init__(
         self,
         user_db: BaseUserDatabase[models.UP, models.ID],
         password_helper: PasswordHelperProtocol | None = None,
+        outbox_db: OutboxDatabase | None = None,
     ):
         self.user_db = user_db
+        self.outbox_db = outbox_db
         if password_helper is None:
             self.password_helper = PasswordHelper()
         else:
@@ -91,6 +120,38 @@ class BaseUserManager(Generic[models.UP, models.ID]):
 
         return user
 
+    async def get_many(self, ids: Sequence[models.ID]) -> list[models.UP | None]:
+        """
+        Get several users by id in a single query.
+
+        :param ids: Ids of the users to retrieve.
+        :return: The users, in the same order as the ids.
+        Users that don't exist are reported as `None`.
+        """
+        unique_ids = list(dict.fromkeys(ids))
+        users = await self.user_db.get_many(unique_ids) if unique_ids else []
+        users_by_id = {user.id: user for user in users}
+        return [users_by_id.get(id) for id in ids]
+
+    async def get_many_by_email(
+        self, user_emails: Sequence[str]
+    ) -> list[models.UP | None]:
+        """
+        Get several users by e-mail in a single query.
+
+        E-mails are matched case-insensitively.
+
+        :param user_emails: E-mails of the users to retrieve.
+        :return: The users, in the same order as the e-mails.
+        Users that don't exist are reported as `None`.
+        """
+        unique_emails = list(dict.fromkeys(user_emails))
+        users = (
+            await self.user_db.get_many_by_email(unique_emails) if unique_emails else []
+        )
+        users_by_email = {user.email.lower(): user for user in users}
+        return [users_by_email.get(email.lower()) for email in user_emails]
+
     async def get_by_oauth_account(self, oauth: str, account_id: str) -> models.UP:
         """
         Get a user by OAuth account.
@@ -128,21 +189,17 @@ class BaseUserManager(Generic[models.UP, models.ID]):
         """
         await self.validate_password(user_create.password, user_create)
 
-        existing_user = await self.user_db.get_by_email(user_create.email)
-        if existing_user is not None:
-            raise exceptions.UserAlreadyExists()
-
         user_dict = (
             user_create.create_update_dict()
             if safe
             else user_create.create_update_dict_superuser()
         )
         password = user_dict.pop("password")
-        user_dict["hashed_password"] = self.password_helper.hash(password)
 
-        created_user = await self.user_db.create(user_dict)
+        created_user = await self._create(user_dict, password)
+        await self._record_event(UserEventType.REGISTERED, created_user)
 
-        await self.on_after_register(created_user, request)
+        await self.trigger_hook("on_after_register", created_user, request)
 
         return created_user
 
@@ -162,7 +219,8 @@ class BaseUserManager(Generic[models.UP, models.ID]):
         """
         Handle the callback after a successful OAuth authentication.
 
-        If the user already exists with this OAuth account, the token is updated.
+        If the user already exists with this OAuth account, the token is updated,
+        if it changed.
 
         If a user with the same e-mail already exists and `associate_by_email` is True,
         the OAuth account is associated to this user.
@@ -200,32 +258,46 @@ class BaseUserManager(Generic[models.UP, models.ID]):
         try:
             user = await self.get_by_oauth_account(oauth_name, account_id)
         except exceptions.UserNotExists:
-            try:
-                # Associate account
-                user = await self.get_by_email(account_email)
-                if not associate_by_email:
-                    raise exceptions.UserAlreadyExists()
-                user = await self.user_db.add_oauth_account(user, oauth_account_dict)
-            except exceptions.UserNotExists:
-                # Create account
-                password = self.password_helper.generate()
-                user_dict = {
-                    "email": account_email,
-                    "hashed_password": self.password_helper.hash(password),
-                    "is_verified": is_verified_by_default,
-                }
-                user = await self.user_db.create(user_dict)
-                user = await self.user_db.add_oauth_account(user, oauth_account_dict)
-                await self.on_after_register(user, request)
+            password = self.password_helper.generate()
+            user_dict: dict[str, Any] = {
+                "email": account_email,
+                "is_verified": is_verified_by_default,
+            }
+            if _implements(self.user_db, "upsert_oauth_user"):
+                # Hashed beforehand, so the hashing doesn't hold the transaction of
+                # the adapter open. It's wasted if the account is associated
+                # to an existing user, which only happens on its first OAuth login.
+                user_dict["hashed_password"] = self.password_helper.hash(password)
+                try:
+                    user, created = await self.user_db.upsert_oauth_user(
+                        oauth_account_dict, user_dict, associate_by_email
+                    )
+                except exceptions.UserEmailConflict as e:
+                    raise exceptions.UserAlreadyExists() from e
+            else:
+                user, created = await self._create_oauth_user(
+                    oauth_account_dict, user_dict, password, associate_by_email
+                )
+
+            if created:
+                await self._record_event(UserEventType.REGISTERED, user)
+                await self.trigger_hook("on_after_register", user, request)
         else:
-            # Update oauth
-            for existing_oauth_account in user.oauth_accounts:
-                if (
-                    existing_oauth_account.account_id == account_id
-                    and existing_oauth_account.oauth_name == oauth_name
-                ):
+            # Update oauth, only if the tokens changed
+            oauth_accounts = {
+                (oauth_account.oauth_name, oauth_account.account_id): oauth_account
+                for oauth_account in user.oauth_accounts
+            }
+            existing_oauth_account = oauth_accounts.get((oauth_name, account_id))
+            if existing_oauth_account is not None:
+                oauth_account_changes = {
+                    field: value
+                    for field, value in oauth_account_dict.items()
+                    if getattr(existing_oauth_account, field) != value
+                }
+                if oauth_account_changes:
                     user = await self.user_db.update_oauth_account(
-                        user, existing_oauth_account, oauth_account_dict
+                        user, existing_oauth_account, oauth_account_changes
                     )
 
         return user
@@ -268,7 +340,7 @@ class BaseUserManager(Generic[models.UP, models.ID]):
 
         user = await self.user_db.add_oauth_account(user, oauth_account_dict)
 
-        await self.on_after_update(user, {}, request)
+        await self.trigger_hook("on_after_update", user, {}, request)
 
         return user
 
@@ -301,7 +373,7 @@ class BaseUserManager(Generic[models.UP, models.ID]):
             self.verification_token_secret,
             self.verification_token_lifetime_seconds,
         )
-        await self.on_after_request_verify(user, token, request)
+        await self.trigger_hook("on_after_request_verify", user, token, request)
 
     async def verify(self, token: str, request: Request | None = None) -> models.UP:
         """
@@ -350,8 +422,9 @@ class BaseUserManager(Generic[models.UP, models.ID]):
             raise exceptions.UserAlreadyVerified()
 
         verified_user = await self._update(user, {"is_verified": True})
+        await self._record_event(UserEventType.VERIFIED, verified_user)
 
-        await self.on_after_verify(verified_user, request)
+        await self.trigger_hook("on_after_verify", verified_user, request)
 
         return verified_user
 
@@ -381,7 +454,7 @@ class BaseUserManager(Generic[models.UP, models.ID]):
             self.reset_password_token_secret,
             self.reset_password_token_lifetime_seconds,
         )
-        await self.on_after_forgot_password(user, token, request)
+        await self.trigger_hook("on_after_forgot_password", user, token, request)
 
     async def reset_password(
         self, token: str, password: str, request: Request | None = None
@@ -432,8 +505,11 @@ class BaseUserManager(Generic[models.UP, models.ID]):
             raise exceptions.UserInactive()
 
         updated_user = await self._update(user, {"password": password})
+        await self._record_event(
+            UserEventType.UPDATED, updated_user, {"fields": ["password"]}
+        )
 
-        await self.on_after_reset_password(user, request)
+        await self.trigger_hook("on_after_reset_password", user, request)
 
         return updated_user
 
@@ -447,7 +523,9 @@ class BaseUserManager(Generic[models.UP, models.ID]):
         """
         Update a user.
 
-        Triggers the on_after_update handler on success
+        Triggers the on_after_update handler on success,
+        with the fields which actually changed.
+        If no field changed, the database is not queried.
 
         :param user_update: The UserUpdate model containing
         the changes to apply to the user.
@@ -462,8 +540,17 @@ class BaseUserManager(Generic[models.UP, models.ID]):
             updated_user_data = user_update.create_update_dict()
         else:
             updated_user_data = user_update.create_update_dict_superuser()
+        updated_user_data = self._get_changes(user, updated_user_data)
         updated_user = await self._update(user, updated_user_data)
-        await self.on_after_update(updated_user, updated_user_data, request)
+        if updated_user_data:
+            await self._record_event(
+                UserEventType.UPDATED,
+                updated_user,
+                {"fields": sorted(updated_user_data)},
+            )
+        await self.trigger_hook(
+            "on_after_update", updated_user, updated_user_data, request
+        )
         return updated_user
 
     async def delete(
@@ -480,7 +567,36 @@ class BaseUserManager(Generic[models.UP, models.ID]):
         """
         await self.on_before_delete(user, request)
         await self.user_db.delete(user)
-        await self.on_after_delete(user, request)
+        await self._record_event(UserEventType.DELETED, user)
+        await self.trigger_hook("on_after_delete", user, request)
+
+    def track_login(self, user: models.UP) -> None:
+        """
+        Record a successful login of a user.
+
+        If a last login tracker is set, the login date is buffered
+        and written later in a bulk update. Otherwise, it does nothing.
+
+        :param user: The user who logged in.
+        """
+        if self.last_login_tracker is not None:
+            self.last_login_tracker.touch(user.id)
+
+    async def trigger_hook(self, name: str, *args: Any) -> None:
+        """
+        Run a hook.
+
+        If a hook dispatcher is set and handles this hook, it's run in the background.
+        Otherwise, it's awaited inline.
+
+        :param name: Name of the hook method, like `on_after_register`.
+        :param args: Arguments passed to the hook.
+        """
+        hook = getattr(self, name)
+        if self.hook_dispatcher is None:
+            await hook(*args)
+        else:
+            await self.hook_dispatcher.dispatch(name, hook, *args)
 
     async def validate_password(
         self, password: str, user: schemas.UC | models.UP
@@ -664,16 +780,140 @@ class BaseUserManager(Generic[models.UP, models.ID]):
 
         return user
 
+    async def list(
+        self,
+        after_id: models.ID | None = None,
+        limit: int = 50,
+        filters: dict[str, Any] | None = None,
+    ) -> list[models.UP]:
+        """
+        List users ordered by id, using keyset pagination.
+
+        To get the next page, pass the id of the last user of the current page
+        as `after_id`.
+
+        :param after_id: Only return users with an id greater than this one.
+        Defaults to `None`, which starts from the beginning.
+        :param limit: Maximum number of users to return. Defaults to 50.
+        :param filters: Exact values to match on user fields,
+        like `{"is_active": True}`. Defaults to `None`.
+        :return: A list of users of type models.UP.
+        """
+        return await self.user_db.list(after_id, limit, filters or {})
+
+    async def export(
+        self, batch_size: int = 1000, filters: dict[str, Any] | None = None
+    ) -> AsyncGenerator[models.UP, None]:
+        """
+        Iterate over all the users, ordered by id.
+
+        Users are retrieved by batches with the `list` method,
+        so memory usage doesn't depend on the number of users.
+
+        :param batch_size: Number of users retrieved per query. Defaults to 1000.
+        :param filters: Exact values to match on user fields,
+        like `{"is_active": True}`. Defaults to `None`.
+        :return: An async generator of users of type models.UP.
+        """
+        after_id: models.ID | None = None
+        while True:
+            users = await self.list(after_id, batch_size, filters)
+            for user in users:
+                yield user
+            if len(users) < batch_size:
+                break
+            after_id = users[-1].id
+
+    async def _record_event(
+        self,
+        event_type: UserEventType,
+        user: models.UP,
+        payload: dict[str, Any] | None = None,
+    ) -> None:
+        if self.outbox_db is None:
+            return
+        await self.outbox_db.add(
+            {
+                "type": event_type.value,
+                "user_id": user.id,
+                "payload": {"email": user.email, **(payload or {})},
+            }
+        )
+
+    async def _create(self, user_dict: dict[str, Any], password: str) -> models.UP:
+        if not _implements(self.user_db, "create_unique"):
+            # The adapter can't enforce uniqueness: check the e-mail beforehand,
+            # so the password isn't hashed for nothing
+            existing_user = await self.user_db.get_by_email(user_dict["email"])
+            if existing_user is not None:
+                raise exceptions.UserAlreadyExists()
+        return await self._insert(user_dict, password)
+
+    async def _insert(self, user_dict: dict[str, Any], password: str) -> models.UP:
+        user_dict["hashed_password"] = self.password_helper.hash(password)
+        if not _implements(self.user_db, "create_unique"):
+            return await self.user_db.create(user_dict)
+        try:
+            return await self.user_db.create_unique(user_dict)
+        except exceptions.UserEmailConflict as e:
+            raise exceptions.UserAlreadyExists() from e
+
+    async def _create_oauth_user(
+        self: "BaseUserManager[models.UOAP, models.ID]",
+        oauth_account_dict: dict[str, Any],
+        user_dict: dict[str, Any],
+        password: str,
+        associate_by_email: bool,
+    ) -> tuple[models.UOAP, bool]:
+        existing_user: models.UOAP | None = None
+        if not _implements(self.user_db, "create_unique"):
+            existing_user = await self.user_db.get_by_email(user_dict["email"])
+
+        if existing_user is None:
+            try:
+                # Create account
+                user = await self._insert(user_dict, password)
+            except exceptions.UserAlreadyExists:
+                if not associate_by_email:
+                    raise
+                existing_user = await self.get_by_email(user_dict["email"])
+            else:
+                return await self.user_db.add_oauth_account(
+                    user, oauth_account_dict
+                ), True
+        elif not associate_by_email:
+            raise exceptions.UserAlreadyExists()
+
+        # Associate account
+        return await self.user_db.add_oauth_account(
+            existing_user, oauth_account_dict
+        ), False
+
+    def _get_changes(
+        self, user: models.UP, update_dict: dict[str, Any]
+    ) -> dict[str, Any]:
+        changes: dict[str, Any] = {}
+        for field, value in update_dict.items():
+            if field == "password":
+                # We can't compare with the hash: a new password is always a change
+                if value is not None:
+                    changes[field] = value
+            elif getattr(user, field, _MISSING) != value:
+                changes[field] = value
+        return changes
+
     async def _update(self, user: models.UP, update_dict: dict[str, Any]) -> models.UP:
+        update_dict = self._get_changes(user, update_dict)
+        if not update_dict:
+            return user
+
         validated_update_dict = {}
+        email_changed = False
         for field, value in update_dict.items():
             if field == "email" and value != user.email:
-                try:
-                    await self.get_by_email(value)
-                    raise exceptions.UserAlreadyExists()
-                except exceptions.UserNotExists:
-                    validated_update_dict["email"] = value
-                    validated_update_dict["is_verified"] = False
+                email_changed = True
+                validated_update_dict["email"] = value
+                validated_update_dict["is_verified"] = False
             elif field == "password" and value is not None:
                 await self.validate_password(value, user)
                 validated_update_dict["hashed_password"] = self.password_helper.hash(
@@ -681,7 +921,22 @@ class BaseUserManager(Generic[models.UP, models.ID]):
                 )
             else:
                 validated_update_dict[field] = value
-        return await self.user_db.update(user, validated_update_dict)
+
+        if not email_changed:
+            return await self.user_db.update(user, validated_update_dict)
+
+        if _implements(self.user_db, "update_unique"):
+            try:
+                return await self.user_db.update_unique(user, validated_update_dict)
+            except exceptions.UserEmailConflict as e:
+                raise exceptions.UserAlreadyExists() from e
+
+        # The adapter can't enforce uniqueness: check the e-mail beforehand
+        try:
+            await self.get_by_email(validated_update_dict["email"])
+            raise exceptions.UserAlreadyExists()
+        except exceptions.UserNotExists:
+            return await self.user_db.update(user, validated_update_dict)
 
 
 class UUIDIDMixin:
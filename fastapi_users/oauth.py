@@ -0,0 +1,240 @@
+import asyncio
+import contextlib
+import copy
+import logging
+import time
+from collections.abc import AsyncIterator, Callable, Iterable, Mapping
+from contextlib import AbstractAsyncContextManager
+from typing import Any, Generic, TypeVar, cast
+
+import httpx
+from httpx_oauth.oauth2 import BaseOAuth2
+
+from fastapi_users.background import PeriodicTask
+from fastapi_users.db import BaseUserDatabase
+from fastapi_users.models import ID, OAP, UOAP
+
+logger = logging.getLogger(__name__)
+
+OC = TypeVar("OC", bound=BaseOAuth2)
+
+
+def create_oauth_http_client(
+    *,
+    http2: bool = False,
+    timeout: float = 10.0,
+    max_connections: int = 100,
+    max_keepalive_connections: int = 20,
+    keepalive_expiry: float = 30.0,
+) -> httpx.AsyncClient:
+    """
+    Create a HTTPX client suited to be shared by OAuth clients.
+
+    Connections to the providers are kept alive between calls,
+    saving a TCP and TLS handshake on each OAuth callback.
+    You're responsible for closing it, typically in your lifespan handler.
+
+    :param http2: Whether to enable HTTP/2. Requires the `h2` package,
+    e.g. with `pip install httpx[http2]`. Defaults to False.
+    :param timeout: Number of seconds before a provider call times out.
+    Defaults to 10.
+    :param max_connections: Maximum number of concurrent connections.
+    Defaults to 100.
+    :param max_keepalive_connections: Maximum number of idle connections
+    kept in the pool. Defaults to 20.
+    :param keepalive_expiry: Number of seconds an idle connection
+    is kept in the pool. Defaults to 30.
+    """
+    return httpx.AsyncClient(
+        http2=http2,
+        timeout=timeout,
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        ),
+    )
+
+
+def with_http_client(oauth_client: OC, http_client: httpx.AsyncClient) -> OC:
+    """
+    Return a copy of an OAuth client sending its requests with the given HTTPX client.
+
+    By default, HTTPX OAuth clients open a new HTTPX client for each call.
+    The given client is reused instead, and never closed by the OAuth client.
+    The original OAuth client is left untouched.
+
+    :param oauth_client: The HTTPX OAuth client instance.
+    :param http_client: The HTTPX client to reuse,
+    e.g. from `create_oauth_http_client`.
+    """
+    oauth_client = copy.copy(oauth_client)
+
+    @contextlib.asynccontextmanager
+    async def get_httpx_client() -> AsyncIterator[httpx.AsyncClient]:
+        yield http_client
+
+    oauth_client.get_httpx_client = get_httpx_client  # type: ignore[method-assign]
+    return oauth_client
+
+
+class _RateLimiter:
+    def __init__(self, rate: float):
+        self.interval = 1 / rate
+        self._next_slot = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self) -> None:
+        async with self._lock:
+            now = time.monotonic()
+            if self._next_slot > now:
+                await asyncio.sleep(self._next_slot - now)
+            self._next_slot = max(now, self._next_slot) + self.interval
+
+
+class OAuthTokenRefresher(PeriodicTask, Generic[UOAP, ID, OAP]):
+    """
+    Periodically refresh the OAuth access tokens nearing expiry.
+
+    Expiring accounts are fetched by batches, refreshed concurrently
+    with their OAuth client and their new tokens are written
+    with `update_oauth_account`.
+
+    Requires the database adapter to implement `get_expiring_oauth_accounts`.
+
+    :param get_database: Callable returning an async context manager
+    yielding a user database adapter instance.
+    :param oauth_clients: The HTTPX OAuth client instances.
+    Accounts of other providers are ignored.
+    :param interval: Number of seconds between two runs. Defaults to 60.
+    :param jitter: Maximum number of seconds randomly added to the interval.
+    Defaults to 0.
+    :param refresh_margin: Number of seconds before expiry
+    from which a token is refreshed. Defaults to 300.
+    :param batch_size: Number of accounts fetched at once. Defaults to 100.
+    :param max_concurrency: Maximum number of concurrent refresh requests.
+    Defaults to 10.
+    :param rate_limits: Optional maximum number of refresh requests per second,
+    by OAuth client name, like `{"google": 5}`.
+    :param lock: Optional lock, to avoid several workers refreshing at the same time.
+    See `PeriodicTask`.
+
+    :attribute refreshed_count: Total number of refreshed tokens since startup.
+    :attribute failed_count: Total number of failed refreshes since startup.
+    """
+
+    refreshed_count: int
+    failed_count: int
+
+    def __init__(
+        self,
+        get_database: Callable[
+            [], AbstractAsyncContextManager[BaseUserDatabase[UOAP, ID]]
+        ],
+        oauth_clients: Iterable[BaseOAuth2],
+        *,
+        interval: float = 60,
+        jitter: float = 0,
+        refresh_margin: int = 300,
+        batch_size: int = 100,
+        max_concurrency: int = 10,
+        rate_limits: Mapping[str, float] | None = None,
+        lock: Callable[[], AbstractAsyncContextManager[bool]] | None = None,
+    ):
+        super().__init__(interval, jitter, lock)
+        self.get_database = get_database
+        self.oauth_clients = {
+            oauth_client.name: oauth_client for oauth_client in oauth_clients
+        }
+        self.refresh_margin = refresh_margin
+        self.batch_size = batch_size
+        self.max_concurrency = max_concurrency
+        self.refreshed_count = 0
+        self.failed_count = 0
+        self._rate_limiters = {
+            name: _RateLimiter(rate) for name, rate in (rate_limits or {}).items()
+        }
+
+    async def run(self) -> None:
+        await self.refresh()
+
+    async def refresh(self) -> int:
+        """
+        Refresh all the tokens nearing expiry.
+
+        :return: The number of refreshed tokens.
+        """
+        refreshed_count = 0
+        expires_before = int(time.time()) + self.refresh_margin
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        after: tuple[int, ID] | None = None
+        accounts: list[tuple[UOAP, OAP]]
+        async with self.get_database() as user_db:
+            while True:
+                accounts = await user_db.get_expiring_oauth_accounts(
+                    expires_before, after, self.batch_size
+                )
+                if not accounts:
+                    break
+                # Get the cursor before the update changes the expiration date
+                last_account = accounts[-1][1]
+                after = (cast(int, last_account.expires_at), last_account.id)
+
+                update_dicts = await asyncio.gather(
+                    *(
+                        self._refresh_token(oauth_account, semaphore)
+                        for _, oauth_account in accounts
+                    )
+                )
+                # Write sequentially: the adapter session isn't concurrency-safe
+                for (user, oauth_account), update_dict in zip(accounts, update_dicts):
+                    if update_dict is None:
+                        continue
+                    try:
+                        await user_db.update_oauth_account(
+                            user, oauth_account, update_dict
+                        )
+                    except Exception:
+                        self.failed_count += 1
+                        logger.exception(
+                            "Error while saving refreshed %s token",
+                            oauth_account.oauth_name,
+                        )
+                    else:
+                        self.refreshed_count += 1
+                        refreshed_count += 1
+
+                if len(accounts) < self.batch_size:
+                    break
+
+        return refreshed_count
+
+    async def _refresh_token(
+        self, oauth_account: OAP, semaphore: asyncio.Semaphore
+    ) -> dict[str, Any] | None:
+        oauth_client = self.oauth_clients.get(oauth_account.oauth_name)
+        if oauth_client is None or oauth_account.refresh_token is None:
+            return None
+
+        # Wait for the provider rate limit first, so it doesn't hold
+        # a concurrency slot other providers could use
+        rate_limiter = self._rate_limiters.get(oauth_account.oauth_name)
+        if rate_limiter is not None:
+            await rate_limiter.wait()
+
+        async with semaphore:
+            try:
+                token = await oauth_client.refresh_token(oauth_account.refresh_token)
+            except Exception:
+                self.failed_count += 1
+                logger.exception(
+                    "Error while refreshing %s token", oauth_account.oauth_name
+                )
+                return None
+
+        return {
+            "access_token": token["access_token"],
+            "expires_at": token.get("expires_at"),
+            # Some providers only issue a new refresh token from time to time
+            "refresh_token": token.get("refresh_token", oauth_account.refresh_token),
+        }
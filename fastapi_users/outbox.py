@@ -0,0 +1,152 @@
+import time
+from collections.abc import Callable, Sequence
+from contextlib import AbstractAsyncContextManager
+from datetime import datetime
+from enum import Enum
+from typing import Any, Generic, Protocol, TypeVar
+
+from fastapi_users import models
+from fastapi_users.background import PeriodicTask
+
+
+class UserEventType(str, Enum):
+    REGISTERED = "user.registered"
+    VERIFIED = "user.verified"
+    UPDATED = "user.updated"
+    DELETED = "user.deleted"
+
+
+class UserEventProtocol(Protocol[models.ID]):
+    """User event protocol that ORM model should follow."""
+
+    type: str
+    user_id: models.ID
+    payload: dict[str, Any]
+    created_at: datetime
+
+
+EP = TypeVar("EP", bound=UserEventProtocol)
+EP_contra = TypeVar("EP_contra", bound=UserEventProtocol, contravariant=True)
+
+
+class OutboxDatabase(Protocol, Generic[EP]):
+    """Protocol for retrieving, creating and updating user events from a database."""
+
+    async def add(self, create_dict: dict[str, Any]) -> None:
+        """
+        Record a user event.
+
+        It's called right after the user write, in a separate write.
+        """
+        ...  # pragma: no cover
+
+    async def get_pending(self, limit: int) -> list[EP]:
+        """Get the oldest events not delivered yet, in the order they were recorded."""
+        ...  # pragma: no cover
+
+    async def mark_delivered(self, events: Sequence[EP]) -> None:
+        """Mark events as delivered, e.g. by deleting them."""
+        ...  # pragma: no cover
+
+
+class OutboxSink(Protocol, Generic[EP_contra]):
+    """Protocol for delivering user events to downstream systems."""
+
+    async def send(self, events: Sequence[EP_contra]) -> None:
+        """
+        Deliver a batch of events, in the given order.
+
+        It should raise an exception if the events can't be delivered,
+        so they are sent again on the next run.
+        """
+        ...  # pragma: no cover
+
+
+class OutboxRelay(PeriodicTask, Generic[EP]):
+    """
+    Periodically deliver the recorded user events to a sink, by batches.
+
+    Events are delivered in the order they were recorded. If the sink fails,
+    the batch is not marked as delivered and is sent again on the next run,
+    before any newer event: the events of a user are always delivered in order,
+    at least once.
+
+    :param get_database: Callable returning an async context manager
+    yielding an outbox database adapter instance.
+    :param sink: The sink delivering the events.
+    :param interval: Number of seconds between two runs. Defaults to 1.
+    :param jitter: Maximum number of seconds randomly added to the interval.
+    Defaults to 0.
+    :param batch_size: Maximum number of events per batch. Defaults to 100.
+    :param lock: Optional lock, to make sure only one worker relays at a time.
+    Several workers relaying at the same time could deliver events out of order.
+    See `PeriodicTask`.
+
+    :attribute delivered_count: Total number of delivered events since startup.
+    :attribute batch_count: Total number of delivered batches since startup.
+    :attribute last_batch_size: Number of events of the last delivered batch.
+    :attribute last_batch_duration: Number of seconds it took to deliver
+    the last batch.
+    """
+
+    delivered_count: int
+    batch_count: int
+    last_batch_size: int
+    last_batch_duration: float
+
+    def __init__(
+        self,
+        get_database: Callable[[], AbstractAsyncContextManager[OutboxDatabase[EP]]],
+        sink: OutboxSink[EP],
+        *,
+        interval: float = 1,
+        jitter: float = 0,
+        batch_size: int = 100,
+        lock: Callable[[], AbstractAsyncContextManager[bool]] | None = None,
+    ):
+        super().__init__(interval, jitter, lock)
+        self.get_database = get_database
+        self.sink = sink
+        self.batch_size = batch_size
+        self.delivered_count = 0
+        self.batch_count = 0
+        self.last_batch_size = 0
+        self.last_batch_duration = 0.0
+
+    @property
+    def throughput(self) -> float:
+        """Number of events per second delivered during the last batch."""
+        if self.last_batch_duration == 0:
+            return 0.0
+        return self.last_batch_size / self.last_batch_duration
+
+    async def run(self) -> None:
+        await self.relay()
+
+    async def relay(self) -> int:
+        """
+        Deliver all the pending events, batch per batch.
+
+        :return: The number of delivered events.
+        """
+        delivered_count = 0
+        async with self.get_database() as database:
+            while True:
+                events = await database.get_pending(self.batch_size)
+                if not events:
+                    break
+
+                start = time.perf_counter()
+                await self.sink.send(events)
+                await database.mark_delivered(events)
+
+                self.last_batch_duration = time.perf_counter() - start
+                self.last_batch_size = len(events)
+                self.batch_count += 1
+                self.delivered_count += len(events)
+                delivered_count += len(events)
+
+                if len(events) < self.batch_size:
+                    break
+
+        return delivered_count
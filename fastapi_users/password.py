@@ -13,6 +13,8 @@ class PasswordHelperProtocol(Protocol):
 
     def hash(self, password: str) -> str: ...  # pragma: no cover
 
+    def identify(self, hashed_password: str) -> bool: ...  # pragma: no cover
+
     def generate(self) -> str: ...  # pragma: no cover
 
 
@@ -36,5 +38,10 @@ class PasswordHelper(PasswordHelperProtocol):
     def hash(self, password: str) -> str:
         return self.password_hash.hash(password)
 
+    def identify(self, hashed_password: str) -> bool:
+        return any(
+            hasher.identify(hashed_password) for hasher in self.password_hash.hashers
+        )
+
     def generate(self) -> str:
         return secrets.token_urlsafe()
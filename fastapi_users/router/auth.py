@@ -65,7 +65,8 @@ def get_auth_router(
                 detail=ErrorCode.LOGIN_USER_NOT_VERIFIED,
             )
         response = await backend.login(strategy, user)
-        await user_manager.on_after_login(user, request, response)
+        user_manager.track_login(user)
+        await user_manager.trigger_hook("on_after_login", user, request, response)
         return response
 
     logout_responses: OpenAPIResponseType = {
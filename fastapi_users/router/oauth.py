@@ -1,6 +1,7 @@
 import secrets
 from typing import Literal
 
+import httpx
 import jwt
 from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from httpx_oauth.integrations.fastapi import OAuth2AuthorizeCallback
@@ -12,6 +13,7 @@ from fastapi_users.authentication import AuthenticationBackend, Authenticator, S
 from fastapi_users.exceptions import UserAlreadyExists
 from fastapi_users.jwt import SecretType, decode_jwt, generate_jwt
 from fastapi_users.manager import BaseUserManager, UserManagerDependency
+from fastapi_users.oauth import with_http_client
 from fastapi_users.router.common import ErrorCode, ErrorModel
 
 STATE_TOKEN_AUDIENCE = "fastapi-users:oauth-state"
@@ -49,9 +51,12 @@ def get_oauth_router(
     csrf_token_cookie_secure: bool = True,
     csrf_token_cookie_httponly: bool = True,
     csrf_token_cookie_samesite: Literal["lax", "strict", "none"] = "lax",
+    http_client: httpx.AsyncClient | None = None,
 ) -> APIRouter:
     """Generate a router with the OAuth routes."""
     router = APIRouter()
+    if http_client is not None:
+        oauth_client = with_http_client(oauth_client, http_client)
     callback_route_name = f"oauth:{oauth_client.name}.{backend.name}.callback"
 
     if redirect_url is not None:
@@ -207,7 +212,8 @@ def get_oauth_router(
 
         # Authenticate
         response = await backend.login(strategy, user)
-        await user_manager.on_after_login(user, request, response)
+        user_manager.track_login(user)
+        await user_manager.trigger_hook("on_after_login", user, request, response)
         return response
 
     return router
@@ -228,9 +234,12 @@ def get_oauth_associate_router(
     csrf_token_cookie_secure: bool = True,
     csrf_token_cookie_httponly: bool = True,
     csrf_token_cookie_samesite: Literal["lax", "strict", "none"] = "lax",
+    http_client: httpx.AsyncClient | None = None,
 ) -> APIRouter:
     """Generate a router with the OAuth routes to associate an authenticated user."""
     router = APIRouter()
+    if http_client is not None:
+        oauth_client = with_http_client(oauth_client, http_client)
 
     get_current_active_user = authenticator.current_user(
         active=True, verified=requires_verification
@@ -1,10 +1,51 @@
-from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+import base64
+import binascii
+from collections.abc import AsyncGenerator
+from typing import Any
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from fastapi.responses import StreamingResponse
 
 from fastapi_users import exceptions, models, schemas
 from fastapi_users.authentication import Authenticator
 from fastapi_users.manager import BaseUserManager, UserManagerDependency
 from fastapi_users.router.common import ErrorCode, ErrorModel
 
+LIST_USERS_MAX_LIMIT = 100
+
+
+def encode_cursor(id: Any) -> str:
+    return base64.urlsafe_b64encode(str(id).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> str:
+    try:
+        return base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+    except (binascii.Error, UnicodeDecodeError) as e:
+        raise exceptions.InvalidID() from e
+
+
+def get_filters(
+    is_active: bool | None, is_verified: bool | None, is_superuser: bool | None
+) -> dict[str, Any]:
+    return {
+        field: value
+        for field, value in (
+            ("is_active", is_active),
+            ("is_verified", is_verified),
+            ("is_superuser", is_superuser),
+        )
+        if value is not None
+    }
+
 
 def get_users_router(
     get_user_manager: UserManagerDependency[models.UP, models.ID],
@@ -12,6 +53,8 @@ def get_users_router(
     user_update_schema: type[schemas.UU],
     authenticator: Authenticator[models.UP, models.ID],
     requires_verification: bool = False,
+    enable_list: bool = False,
+    enable_export: bool = False,
 ) -> APIRouter:
     """Generate a router with the authentication routes."""
     router = APIRouter()
@@ -109,6 +152,107 @@ def get_users_router(
                 detail=ErrorCode.UPDATE_USER_EMAIL_ALREADY_EXISTS,
             )
 
+    if enable_list:
+
+        @router.get(
+            "/",
+            response_model=schemas.UserPage[user_schema],  # type: ignore
+            dependencies=[Depends(get_current_superuser)],
+            name="users:list_users",
+            responses={
+                status.HTTP_401_UNAUTHORIZED: {
+                    "description": "Missing token or inactive user.",
+                },
+                status.HTTP_403_FORBIDDEN: {
+                    "description": "Not a superuser.",
+                },
+                status.HTTP_400_BAD_REQUEST: {
+                    "model": ErrorModel,
+                    "content": {
+                        "application/json": {
+                            "examples": {
+                                ErrorCode.LIST_USERS_INVALID_CURSOR: {
+                                    "summary": "Invalid pagination cursor.",
+                                    "value": {
+                                        "detail": ErrorCode.LIST_USERS_INVALID_CURSOR
+                                    },
+                                },
+                            }
+                        }
+                    },
+                },
+            },
+        )
+        async def list_users(
+            cursor: str | None = None,
+            limit: int = Query(50, ge=1, le=LIST_USERS_MAX_LIMIT),
+            is_active: bool | None = None,
+            is_verified: bool | None = None,
+            is_superuser: bool | None = None,
+            user_manager: BaseUserManager[models.UP, models.ID] = Depends(
+                get_user_manager
+            ),
+        ):
+            after_id: models.ID | None = None
+            if cursor is not None:
+                try:
+                    after_id = user_manager.parse_id(decode_cursor(cursor))
+                except exceptions.InvalidID as e:
+                    raise HTTPException(
+                        status.HTTP_400_BAD_REQUEST,
+                        detail=ErrorCode.LIST_USERS_INVALID_CURSOR,
+                    ) from e
+
+            filters = get_filters(is_active, is_verified, is_superuser)
+
+            # Fetch one more user to know if there is a next page
+            users = await user_manager.list(after_id, limit + 1, filters)
+            next_cursor = None
+            if len(users) > limit:
+                users = users[:limit]
+                next_cursor = encode_cursor(users[-1].id)
+
+            return schemas.UserPage[user_schema](  # type: ignore
+                items=[user_schema.model_validate(user) for user in users],
+                next_cursor=next_cursor,
+            )
+
+    if enable_export:
+
+        @router.get(
+            "/export",
+            response_class=StreamingResponse,
+            dependencies=[Depends(get_current_superuser)],
+            name="users:export_users",
+            responses={
+                status.HTTP_200_OK: {
+                    "description": "One JSON user per line.",
+                    "content": {"application/x-ndjson": {}},
+                },
+                status.HTTP_401_UNAUTHORIZED: {
+                    "description": "Missing token or inactive user.",
+                },
+                status.HTTP_403_FORBIDDEN: {
+                    "description": "Not a superuser.",
+                },
+            },
+        )
+        async def export_users(
+            is_active: bool | None = None,
+            is_verified: bool | None = None,
+            is_superuser: bool | None = None,
+            user_manager: BaseUserManager[models.UP, models.ID] = Depends(
+                get_user_manager
+            ),
+        ):
+            filters = get_filters(is_active, is_verified, is_superuser)
+
+            async def _export() -> AsyncGenerator[str, None]:
+                async for user in user_manager.export(filters=filters):
+                    yield user_schema.model_validate(user).model_dump_json() + "\n"
+
+            return StreamingResponse(_export(), media_type="application/x-ndjson")
+
     @router.get(
         "/{id}",
         response_model=user_schema,
@@ -57,6 +57,13 @@ UC = TypeVar("UC", bound=BaseUserCreate)
 UU = TypeVar("UU", bound=BaseUserUpdate)
 
 
+class UserPage(BaseModel, Generic[U]):
+    """Page of users, with the cursor to get the next one."""
+
+    items: list[U]
+    next_cursor: str | None = None
+
+
 class BaseOAuthAccount(BaseModel, Generic[models.ID]):
     """Base OAuth account model."""
 
@@ -350,6 +350,20 @@ def mock_user_db(
         async def delete(self, user: UserModel) -> None:
             pass
 
+        async def list(
+            self, after_id: UUID4 | None, limit: int, filters: dict[str, Any]
+        ) -> list[UserModel]:
+            users = sorted(
+                [user, verified_user, inactive_user, superuser, verified_superuser],
+                key=lambda u: u.id,
+            )
+            return [
+                u
+                for u in users
+                if (after_id is None or u.id > after_id)
+                and all(getattr(u, field) == value for field, value in filters.items())
+            ][:limit]
+
     return MockUserDatabase()
 
 
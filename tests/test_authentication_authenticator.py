@@ -1,3 +1,5 @@
+import asyncio
+import contextlib
 from collections.abc import AsyncGenerator, Sequence
 from typing import Generic
 
@@ -156,3 +158,261 @@ async def test_authenticators_with_same_name(get_test_auth_client, get_backend_n
     with pytest.raises(DuplicateBackendNamesError):
         async for _ in get_test_auth_client([get_backend_none(), get_backend_none()]):
             pass
+
+
+@pytest.mark.authentication
+@pytest.mark.asyncio
+async def test_authenticator_cached_per_request(
+    get_user_manager, get_test_client, superuser: UserModel
+):
+    strategy = UserStrategy(superuser)
+    read_token_calls = 0
+
+    async def read_token(token, user_manager):
+        nonlocal read_token_calls
+        read_token_calls += 1
+        return superuser
+
+    strategy.read_token = read_token  # type: ignore
+    backend = AuthenticationBackend(
+        name="user", transport=MockTransport(), get_strategy=lambda: strategy
+    )
+    authenticator = Authenticator([backend], get_user_manager)
+
+    app = FastAPI()
+
+    @app.get(
+        "/test-current-superuser",
+        response_model=User,
+        dependencies=[Depends(authenticator.current_user(active=True))],
+    )
+    def test_current_superuser(
+        user: UserModel = Depends(
+            authenticator.current_user(active=True, superuser=True)
+        ),
+        user_token=Depends(authenticator.current_user_token(verified=False)),
+    ):
+        return user
+
+    async for client in get_test_client(app):
+        response = await client.get("/test-current-superuser")
+        assert response.status_code == status.HTTP_200_OK
+        assert read_token_calls == 1
+
+        response = await client.get("/test-current-superuser")
+        assert response.status_code == status.HTTP_200_OK
+        assert read_token_calls == 2
+
+
+class NoneSecurityScheme(SecurityBase):
+    def __call__(self, request: Request) -> str | None:
+        return None
+
+
+class NoneTransport(Transport):
+    scheme: NoneSecurityScheme
+
+    def __init__(self):
+        self.scheme = NoneSecurityScheme()
+
+
+@pytest.mark.authentication
+class TestLazyUserManager:
+    @pytest.fixture
+    def get_lazy_test_client(self, get_test_client, get_user_manager, user_manager):
+        async def _get_lazy_test_client(
+            backends: list[AuthenticationBackend], resolved: list[str]
+        ) -> AsyncGenerator[httpx.AsyncClient, None]:
+            @contextlib.asynccontextmanager
+            async def get_user_manager_context():
+                resolved.append("user_manager")
+                yield user_manager
+                resolved.append("teardown")
+
+            authenticator = Authenticator(
+                backends,
+                get_user_manager,
+                get_user_manager_context=get_user_manager_context,
+            )
+
+            app = FastAPI()
+
+            @app.get("/test-current-user")
+            def test_current_user(
+                user: UserModel | None = Depends(
+                    authenticator.current_user(optional=True)
+                ),
+            ):
+                return {"authenticated": user is not None}
+
+            async for client in get_test_client(app):
+                yield client
+
+        return _get_lazy_test_client
+
+    @pytest.mark.asyncio
+    async def test_no_token(self, get_lazy_test_client, user: UserModel):
+        resolved: list[str] = []
+        backend = AuthenticationBackend(
+            name="notoken",
+            transport=NoneTransport(),
+            get_strategy=lambda: UserStrategy(user),
+        )
+        async for client in get_lazy_test_client([backend], resolved):
+            response = await client.get("/test-current-user")
+            assert response.status_code == status.HTTP_200_OK
+            assert response.json() == {"authenticated": False}
+            assert resolved == []
+
+    @pytest.mark.asyncio
+    async def test_token(
+        self, get_lazy_test_client, get_backend_none, get_backend_user
+    ):
+        resolved: list[str] = []
+        async for client in get_lazy_test_client(
+            [get_backend_none(), get_backend_user()], resolved
+        ):
+            response = await client.get("/test-current-user")
+            assert response.status_code == status.HTTP_200_OK
+            assert response.json() == {"authenticated": True}
+            assert resolved == ["user_manager", "teardown"]
+
+
+class SlowStrategy(Strategy, Generic[models.UP]):
+    def __init__(self, user: models.UP | None, delay: float, events: list[str]):
+        self.user = user
+        self.delay = delay
+        self.events = events
+
+    async def read_token(
+        self, token: str | None, user_manager: BaseUserManager[models.UP, models.ID]
+    ) -> models.UP | None:
+        self.events.append(f"start:{self.delay}")
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            # Simulate an asynchronous cleanup, like closing a connection
+            await asyncio.sleep(0.01)
+            self.events.append(f"cleanup:{self.delay}")
+            raise
+        self.events.append(f"end:{self.delay}")
+        return self.user
+
+
+class ErrorStrategy(Strategy):
+    async def read_token(
+        self, token: str | None, user_manager: BaseUserManager[models.UP, models.ID]
+    ) -> models.UP | None:
+        raise RuntimeError()
+
+
+@pytest.mark.authentication
+class TestConcurrentBackends:
+    @pytest.fixture
+    def get_concurrent_test_client(
+        self, get_test_client, get_user_manager, user_manager
+    ):
+        async def _get_concurrent_test_client(
+            strategies: list[Strategy], events: list[str] | None = None
+        ) -> AsyncGenerator[httpx.AsyncClient, None]:
+            def get_strategy_getter(strategy: Strategy):
+                return lambda: strategy
+
+            backends: list[AuthenticationBackend] = [
+                AuthenticationBackend(
+                    name="notoken",
+                    transport=NoneTransport(),
+                    get_strategy=lambda: NoneStrategy(),
+                )
+            ]
+            backends += [
+                AuthenticationBackend(
+                    name=f"slow{i}",
+                    transport=MockTransport(),
+                    get_strategy=get_strategy_getter(strategy),
+                )
+                for i, strategy in enumerate(strategies)
+            ]
+
+            @contextlib.asynccontextmanager
+            async def get_user_manager_context():
+                yield user_manager
+
+            authenticator = Authenticator(
+                backends,
+                get_user_manager,
+                get_user_manager_context=get_user_manager_context,
+                concurrent_backends=True,
+            )
+
+            app = FastAPI()
+
+            @app.get("/test-current-user", response_model=User)
+            def test_current_user(
+                user: UserModel = Depends(authenticator.current_user()),
+            ):
+                if events is not None:
+                    events.append("response")
+                return user
+
+            async for client in get_test_client(app):
+                yield client
+
+        return _get_concurrent_test_client
+
+    @pytest.mark.asyncio
+    async def test_precedence(
+        self,
+        get_concurrent_test_client,
+        user: UserModel,
+        superuser: UserModel,
+    ):
+        events: list[str] = []
+        strategies = [
+            SlowStrategy(None, 0.03, events),
+            SlowStrategy(user, 0.02, events),
+            SlowStrategy(superuser, 0.01, events),
+        ]
+        async for client in get_concurrent_test_client(strategies):
+            response = await client.get("/test-current-user")
+            assert response.status_code == status.HTTP_200_OK
+            assert response.json()["id"] == str(user.id)
+            assert events[:3] == ["start:0.03", "start:0.02", "start:0.01"]
+
+    @pytest.mark.asyncio
+    async def test_cancel_remaining(self, get_concurrent_test_client, user: UserModel):
+        events: list[str] = []
+        strategies = [SlowStrategy(user, 0, events), SlowStrategy(user, 1, events)]
+        async for client in get_concurrent_test_client(strategies):
+            response = await client.get("/test-current-user")
+            assert response.status_code == status.HTTP_200_OK
+            await asyncio.sleep(0)
+            assert "end:1" not in events
+
+    @pytest.mark.asyncio
+    async def test_cleanup_before_response(
+        self, get_concurrent_test_client, user: UserModel
+    ):
+        events: list[str] = []
+        strategies = [SlowStrategy(user, 0, events), SlowStrategy(user, 1, events)]
+        async for client in get_concurrent_test_client(strategies, events):
+            response = await client.get("/test-current-user")
+            assert response.status_code == status.HTTP_200_OK
+            assert events.index("cleanup:1") < events.index("response")
+
+    @pytest.mark.asyncio
+    async def test_remaining_error(self, get_concurrent_test_client, user: UserModel):
+        events: list[str] = []
+        strategies = [SlowStrategy(user, 0.01, events), ErrorStrategy()]
+        async for client in get_concurrent_test_client(strategies):
+            response = await client.get("/test-current-user")
+            assert response.status_code == status.HTTP_200_OK
+            assert response.json()["id"] == str(user.id)
+
+    @pytest.mark.asyncio
+    async def test_none(self, get_concurrent_test_client):
+        events: list[str] = []
+        strategies = [SlowStrategy(None, 0, events), SlowStrategy(None, 0, events)]
+        async for client in get_concurrent_test_client(strategies):
+            response = await client.get("/test-current-user")
+            assert response.status_code == status.HTTP_401_UNAUTHORIZED
@@ -0,0 +1,279 @@
+import contextlib
+
+import httpx
+import pytest
+from fastapi import Depends, FastAPI, WebSocket, status
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from fastapi_users.authentication import (
+    AuthenticationBackend,
+    AuthenticationMiddleware,
+    Authenticator,
+)
+from fastapi_users.authentication.middleware import (
+    MissingUserManagerContextError,
+    StrategyDependenciesError,
+)
+from tests.conftest import MockStrategy, MockTransport, UserModel
+
+
+async def starlette_endpoint(request: Request):
+    user = request.user
+    return JSONResponse({"email": user.email if user else None})
+
+
+@pytest.fixture
+def authenticator(
+    get_user_manager, mock_authentication: AuthenticationBackend
+) -> Authenticator:
+    return Authenticator([mock_authentication], get_user_manager)
+
+
+@pytest.fixture
+def get_user_manager_context(user_manager):
+    @contextlib.asynccontextmanager
+    async def _get_user_manager_context():
+        yield user_manager
+
+    return _get_user_manager_context
+
+
+@pytest.fixture
+def app(authenticator: Authenticator, get_user_manager_context) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(
+        AuthenticationMiddleware,
+        authenticator=authenticator,
+        get_user_manager_context=get_user_manager_context,
+    )
+    app.mount("/starlette", Starlette(routes=[Route("/", starlette_endpoint)]))
+
+    @app.get("/current-user")
+    def current_user(
+        user: UserModel = Depends(authenticator.current_user(active=True)),
+    ):
+        return {"email": user.email}
+
+    @app.websocket("/ws")
+    async def websocket_endpoint(websocket: WebSocket):
+        await websocket.accept()
+        user = websocket.scope["user"]
+        await websocket.send_json({"email": user.email if user else None})
+        await websocket.close()
+
+    return app
+
+
+@pytest.fixture
+async def test_client(get_test_client, app: FastAPI):
+    async for client in get_test_client(app):
+        yield client
+
+
+@pytest.mark.authentication
+class TestAuthenticationMiddleware:
+    @pytest.mark.asyncio
+    async def test_starlette_route_anonymous(self, test_client: httpx.AsyncClient):
+        response = await test_client.get("/starlette/")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {"email": None}
+
+    @pytest.mark.asyncio
+    async def test_starlette_route_authenticated(
+        self, test_client: httpx.AsyncClient, user: UserModel
+    ):
+        response = await test_client.get(
+            "/starlette/", headers={"Authorization": f"Bearer {user.id}"}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {"email": user.email}
+
+    @pytest.mark.asyncio
+    async def test_current_user_reuses_result(
+        self, test_client: httpx.AsyncClient, user: UserModel, mocker
+    ):
+        read_token_spy = mocker.spy(MockStrategy, "read_token")
+        response = await test_client.get(
+            "/current-user", headers={"Authorization": f"Bearer {user.id}"}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {"email": user.email}
+        assert read_token_spy.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_current_user_inactive(
+        self, test_client: httpx.AsyncClient, inactive_user: UserModel
+    ):
+        response = await test_client.get(
+            "/current-user", headers={"Authorization": f"Bearer {inactive_user.id}"}
+        )
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    @pytest.mark.asyncio
+    async def test_websocket(
+        self,
+        app: FastAPI,
+        authenticator: Authenticator,
+        get_user_manager_context,
+        user: UserModel,
+    ):
+        middleware = AuthenticationMiddleware(
+            app, authenticator, get_user_manager_context
+        )
+        messages = []
+
+        async def receive():
+            return {"type": "websocket.connect"}
+
+        async def send(message):
+            messages.append(message)
+
+        scope = {
+            "type": "websocket",
+            "path": "/ws",
+            "raw_path": b"/ws",
+            "root_path": "",
+            "scheme": "ws",
+            "query_string": b"",
+            "headers": [(b"authorization", f"Bearer {user.id}".encode())],
+            "subprotocols": [],
+            "app": app,
+        }
+        await middleware(scope, receive, send)
+
+        assert scope["user"] == user
+
+    @pytest.mark.asyncio
+    async def test_lifespan(
+        self, authenticator: Authenticator, get_user_manager_context, mocker
+    ):
+        app_spy = mocker.AsyncMock()
+        middleware = AuthenticationMiddleware(
+            app_spy, authenticator, get_user_manager_context
+        )
+
+        scope = {"type": "lifespan"}
+        await middleware(scope, mocker.AsyncMock(), mocker.AsyncMock())
+
+        app_spy.assert_awaited_once()
+        assert "user" not in scope
+
+
+def get_http_scope(user: UserModel) -> dict:
+    return {
+        "type": "http",
+        "method": "GET",
+        "path": "/",
+        "headers": [(b"authorization", f"Bearer {user.id}".encode())],
+    }
+
+
+@pytest.mark.authentication
+class TestUserManagerContext:
+    @pytest.mark.asyncio
+    async def test_authenticator_context(
+        self, get_user_manager, get_user_manager_context, user: UserModel, mocker
+    ):
+        authenticator = Authenticator(
+            [
+                AuthenticationBackend(
+                    name="mock",
+                    transport=MockTransport(tokenUrl="/login"),
+                    get_strategy=lambda: MockStrategy(),
+                )
+            ],
+            get_user_manager,
+            get_user_manager_context=get_user_manager_context,
+        )
+        middleware = AuthenticationMiddleware(mocker.AsyncMock(), authenticator)
+
+        scope = get_http_scope(user)
+        await middleware(scope, mocker.AsyncMock(), mocker.AsyncMock())
+
+        assert scope["user"] == user
+
+    def test_missing(self, authenticator: Authenticator, mocker):
+        with pytest.raises(MissingUserManagerContextError):
+            AuthenticationMiddleware(mocker.AsyncMock(), authenticator)
+
+
+@pytest.mark.authentication
+class TestStrategyContexts:
+    @pytest.mark.asyncio
+    async def test_async_get_strategy(
+        self, get_user_manager, get_user_manager_context, user: UserModel, mocker
+    ):
+        async def get_strategy():
+            return MockStrategy()
+
+        backend = AuthenticationBackend(
+            name="mock",
+            transport=MockTransport(tokenUrl="/login"),
+            get_strategy=get_strategy,
+        )
+        authenticator = Authenticator([backend], get_user_manager)
+        middleware = AuthenticationMiddleware(
+            mocker.AsyncMock(), authenticator, get_user_manager_context
+        )
+
+        scope = get_http_scope(user)
+        await middleware(scope, mocker.AsyncMock(), mocker.AsyncMock())
+
+        assert scope["user"] == user
+
+    def test_get_strategy_with_parameters(
+        self, get_user_manager, get_user_manager_context, mocker
+    ):
+        def get_strategy(resource=Depends(lambda: None)):
+            return MockStrategy()  # pragma: no cover
+
+        backend = AuthenticationBackend(
+            name="mock",
+            transport=MockTransport(tokenUrl="/login"),
+            get_strategy=get_strategy,
+        )
+        authenticator = Authenticator([backend], get_user_manager)
+
+        with pytest.raises(StrategyDependenciesError) as excinfo:
+            AuthenticationMiddleware(
+                mocker.AsyncMock(), authenticator, get_user_manager_context
+            )
+        assert excinfo.value.backend_name == "mock"
+
+    @pytest.mark.asyncio
+    async def test_strategy_context(
+        self, get_user_manager, get_user_manager_context, user: UserModel, mocker
+    ):
+        events: list[str] = []
+
+        def get_strategy(resource=Depends(lambda: None)):
+            return MockStrategy()  # pragma: no cover
+
+        @contextlib.asynccontextmanager
+        async def get_strategy_context():
+            events.append("enter")
+            yield MockStrategy()
+            events.append("exit")
+
+        backend = AuthenticationBackend(
+            name="mock",
+            transport=MockTransport(tokenUrl="/login"),
+            get_strategy=get_strategy,
+        )
+        authenticator = Authenticator([backend], get_user_manager)
+        app_spy = mocker.AsyncMock(side_effect=lambda *args: events.append("app"))
+        middleware = AuthenticationMiddleware(
+            app_spy,
+            authenticator,
+            get_user_manager_context,
+            get_strategy_contexts={"mock": get_strategy_context},
+        )
+
+        scope = get_http_scope(user)
+        await middleware(scope, mocker.AsyncMock(), mocker.AsyncMock())
+
+        assert scope["user"] == user
+        assert events == ["enter", "exit", "app"]
@@ -0,0 +1,34 @@
+import pytest
+
+from fastapi_users.authentication.strategy.base import get_users_by_ids
+from tests.conftest import MockStrategy, UserModel
+
+
+@pytest.mark.authentication
+@pytest.mark.asyncio
+async def test_read_tokens_default(user_manager, user: UserModel):
+    strategy = MockStrategy()
+    users = await strategy.read_tokens([str(user.id), "INVALID"], user_manager)
+    assert [u.id if u else None for u in users] == [user.id, None]
+
+
+@pytest.mark.authentication
+@pytest.mark.asyncio
+async def test_get_users_by_ids(user_manager, user: UserModel, mocker):
+    get_many_spy = mocker.spy(user_manager.user_db, "get_many")
+
+    users = await get_users_by_ids(
+        [str(user.id), None, "INVALID", str(user.id)], user_manager
+    )
+
+    assert [u.id if u else None for u in users] == [user.id, None, None, user.id]
+    get_many_spy.assert_called_once_with([user.id])
+
+
+@pytest.mark.authentication
+@pytest.mark.asyncio
+async def test_get_users_by_ids_none(user_manager, mocker):
+    get_many_spy = mocker.spy(user_manager.user_db, "get_many")
+
+    assert await get_users_by_ids([None, "INVALID"], user_manager) == [None, None]
+    get_many_spy.assert_not_called()
@@ -1,15 +1,24 @@
+import contextlib
 import dataclasses
 import uuid
-from datetime import datetime, timezone
+from collections.abc import Sequence
+from datetime import datetime, timedelta, timezone
 from typing import Any
 
 import pytest
+from pytest_mock import MockerFixture
 
 from fastapi_users.authentication.strategy import (
     AccessTokenDatabase,
+    AccessTokenLastUsedTracker,
     AccessTokenProtocol,
+    AccessTokenSweeper,
     DatabaseStrategy,
 )
+from fastapi_users.authentication.strategy.db.strategy import (
+    DatabaseStrategyDestroyNotSupportedError,
+)
+from fastapi_users.db import BaseUserDatabase
 from tests.conftest import IDType, UserModel
 
 
@@ -61,6 +70,64 @@ class AccessTokenDatabaseMock(AccessTokenDatabase[AccessTokenModel]):
             pass
 
 
+class AccessTokenDatabaseStructuralMock:
+    """Follow the protocol structurally, without any of its optional methods."""
+
+    def __init__(self):
+        self.store: dict[str, AccessTokenModel] = {}
+
+    get_by_token = AccessTokenDatabaseMock.get_by_token
+    create = AccessTokenDatabaseMock.create
+    update = AccessTokenDatabaseMock.update
+    delete = AccessTokenDatabaseMock.delete
+
+
+class AccessTokenDatabaseExtendedMock(AccessTokenDatabaseMock):
+    def __init__(self, user_db: BaseUserDatabase[UserModel, IDType]):
+        super().__init__()
+        self.user_db = user_db
+        self.last_used: dict[str, datetime] = {}
+
+    async def get_by_tokens(
+        self, tokens: Sequence[str], max_age: datetime | None = None
+    ) -> list[AccessTokenModel]:
+        access_tokens = [await self.get_by_token(token, max_age) for token in tokens]
+        return [
+            access_token for access_token in access_tokens if access_token is not None
+        ]
+
+    async def get_user_by_token(
+        self, token: str, max_age: datetime | None = None
+    ) -> UserModel | None:
+        access_token = await self.get_by_token(token, max_age)
+        if access_token is None:
+            return None
+        return await self.user_db.get(access_token.user_id)
+
+    async def delete_by_token(self, token: str) -> None:
+        self.store.pop(token, None)
+
+    async def delete_by_user(self, user_id: Any) -> None:
+        self.store = {
+            token: access_token
+            for token, access_token in self.store.items()
+            if access_token.user_id != user_id
+        }
+
+    async def delete_expired(self, max_age: datetime, limit: int) -> int:
+        expired_tokens = [
+            token
+            for token, access_token in self.store.items()
+            if access_token.created_at < max_age
+        ][:limit]
+        for token in expired_tokens:
+            del self.store[token]
+        return len(expired_tokens)
+
+    async def update_last_used(self, last_used: dict[str, datetime]) -> None:
+        self.last_used.update(last_used)
+
+
 @pytest.fixture
 def access_token_database() -> AccessTokenDatabaseMock:
     return AccessTokenDatabaseMock()
@@ -71,6 +138,25 @@ def database_strategy(access_token_database: AccessTokenDatabaseMock):
     return DatabaseStrategy(access_token_database, 3600)
 
 
+@pytest.fixture
+def database_strategy_structural():
+    return DatabaseStrategy(AccessTokenDatabaseStructuralMock(), 3600)
+
+
+@pytest.fixture
+def access_token_database_extended(
+    mock_user_db: BaseUserDatabase[UserModel, IDType],
+) -> AccessTokenDatabaseExtendedMock:
+    return AccessTokenDatabaseExtendedMock(mock_user_db)
+
+
+@pytest.fixture
+def database_strategy_extended(
+    access_token_database_extended: AccessTokenDatabaseExtendedMock,
+):
+    return DatabaseStrategy(access_token_database_extended, 3600)
+
+
 @pytest.mark.authentication
 class TestReadToken:
     @pytest.mark.asyncio
@@ -120,6 +206,157 @@ class TestReadToken:
         assert authenticated_user is not None
         assert authenticated_user.id == user.id
 
+    @pytest.mark.asyncio
+    async def test_structural_adapter(
+        self,
+        database_strategy_structural: DatabaseStrategy[
+            UserModel, IDType, AccessTokenModel
+        ],
+        user_manager,
+        user: UserModel,
+    ):
+        await database_strategy_structural.database.create(
+            {"token": "TOKEN", "user_id": user.id}
+        )
+        authenticated_user = await database_strategy_structural.read_token(
+            "TOKEN", user_manager
+        )
+        assert authenticated_user is not None
+        assert authenticated_user.id == user.id
+
+
+@pytest.mark.authentication
+class TestReadTokenExtended:
+    @pytest.mark.asyncio
+    async def test_invalid_token(
+        self,
+        database_strategy_extended: DatabaseStrategy[
+            UserModel, IDType, AccessTokenModel
+        ],
+        user_manager,
+    ):
+        authenticated_user = await database_strategy_extended.read_token(
+            "TOKEN", user_manager
+        )
+        assert authenticated_user is None
+
+    @pytest.mark.asyncio
+    async def test_valid_token(
+        self,
+        database_strategy_extended: DatabaseStrategy[
+            UserModel, IDType, AccessTokenModel
+        ],
+        access_token_database_extended: AccessTokenDatabaseExtendedMock,
+        user_manager,
+        user: UserModel,
+        mocker: MockerFixture,
+    ):
+        get_spy = mocker.spy(user_manager, "get")
+        await access_token_database_extended.create(
+            {"token": "TOKEN", "user_id": user.id}
+        )
+        authenticated_user = await database_strategy_extended.read_token(
+            "TOKEN", user_manager
+        )
+        assert authenticated_user is not None
+        assert authenticated_user.id == user.id
+        get_spy.assert_not_called()
+
+
+@pytest.mark.authentication
+class TestReadTokens:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "strategy_fixture",
+        [
+            "database_strategy",
+            "database_strategy_extended",
+            "database_strategy_structural",
+        ],
+    )
+    async def test_read_tokens(
+        self,
+        request: pytest.FixtureRequest,
+        strategy_fixture: str,
+        user_manager,
+        user: UserModel,
+        inactive_user: UserModel,
+    ):
+        database_strategy: DatabaseStrategy[UserModel, IDType, AccessTokenModel] = (
+            request.getfixturevalue(strategy_fixture)
+        )
+        await database_strategy.database.create({"token": "TOKEN1", "user_id": user.id})
+        await database_strategy.database.create(
+            {"token": "TOKEN2", "user_id": inactive_user.id}
+        )
+        await database_strategy.database.create(
+            {"token": "TOKEN3", "user_id": uuid.uuid4()}
+        )
+        await database_strategy.database.create(
+            {
+                "token": "TOKEN4",
+                "user_id": user.id,
+                "created_at": datetime.now(timezone.utc) - timedelta(hours=2),
+            }
+        )
+
+        users = await database_strategy.read_tokens(
+            ["TOKEN1", "INVALID", "TOKEN2", "TOKEN3", "TOKEN4", "TOKEN1"],
+            user_manager,
+        )
+
+        assert [u.id if u else None for u in users] == [
+            user.id,
+            None,
+            inactive_user.id,
+            None,
+            None,
+            user.id,
+        ]
+
+    @pytest.mark.asyncio
+    async def test_no_lifetime(
+        self,
+        access_token_database: AccessTokenDatabaseMock,
+        user_manager,
+        user: UserModel,
+    ):
+        database_strategy = DatabaseStrategy(access_token_database)
+        await access_token_database.create(
+            {
+                "token": "TOKEN",
+                "user_id": user.id,
+                "created_at": datetime.now(timezone.utc) - timedelta(days=365),
+            }
+        )
+
+        users = await database_strategy.read_tokens(["TOKEN"], user_manager)
+        assert [u.id if u else None for u in users] == [user.id]
+
+    @pytest.mark.asyncio
+    async def test_hash_tokens_last_used_tracker(
+        self,
+        access_token_database_extended: AccessTokenDatabaseExtendedMock,
+        access_token_last_used_tracker: AccessTokenLastUsedTracker[AccessTokenModel],
+        user_manager,
+        user: UserModel,
+    ):
+        database_strategy = DatabaseStrategy(
+            access_token_database_extended,
+            3600,
+            hash_tokens=True,
+            last_used_tracker=access_token_last_used_tracker,
+        )
+        token = await database_strategy.write_token(user)
+
+        users = await database_strategy.read_tokens([token, "INVALID"], user_manager)
+        assert [u.id if u else None for u in users] == [user.id, None]
+
+        await access_token_last_used_tracker.flush()
+        assert list(access_token_database_extended.last_used.keys()) == list(
+            access_token_database_extended.store.keys()
+        )
+
 
 @pytest.mark.authentication
 @pytest.mark.asyncio
@@ -137,13 +374,212 @@ async def test_write_token(
 
 @pytest.mark.authentication
 @pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "strategy_fixture", ["database_strategy", "database_strategy_structural"]
+)
 async def test_destroy_token(
-    database_strategy: DatabaseStrategy[UserModel, IDType, AccessTokenModel],
-    access_token_database: AccessTokenDatabaseMock,
-    user: UserModel,
+    request: pytest.FixtureRequest, strategy_fixture: str, user: UserModel
 ):
-    await access_token_database.create({"token": "TOKEN", "user_id": user.id})
+    database_strategy: DatabaseStrategy[UserModel, IDType, AccessTokenModel] = (
+        request.getfixturevalue(strategy_fixture)
+    )
+    await database_strategy.database.create({"token": "TOKEN", "user_id": user.id})
 
     await database_strategy.destroy_token("TOKEN", user)
 
-    assert await access_token_database.get_by_token("TOKEN") is None
+    assert await database_strategy.database.get_by_token("TOKEN") is None
+
+
+@pytest.mark.authentication
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "method,args",
+    [
+        ("delete_by_user", ("USER_ID",)),
+        ("delete_expired", (datetime.now(timezone.utc), 100)),
+        ("update_last_used", ({},)),
+    ],
+)
+async def test_optional_methods_not_implemented(
+    access_token_database: AccessTokenDatabaseMock, method: str, args: tuple
+):
+    with pytest.raises(NotImplementedError):
+        await getattr(access_token_database, method)(*args)
+
+
+@pytest.mark.authentication
+@pytest.mark.asyncio
+async def test_destroy_token_extended(
+    database_strategy_extended: DatabaseStrategy[UserModel, IDType, AccessTokenModel],
+    access_token_database_extended: AccessTokenDatabaseExtendedMock,
+    user: UserModel,
+    mocker: MockerFixture,
+):
+    get_by_token_spy = mocker.spy(access_token_database_extended, "get_by_token")
+    await access_token_database_extended.create({"token": "TOKEN", "user_id": user.id})
+
+    await database_strategy_extended.destroy_token("TOKEN", user)
+
+    get_by_token_spy.assert_not_called()
+    assert await access_token_database_extended.get_by_token("TOKEN") is None
+
+
+@pytest.mark.authentication
+@pytest.mark.asyncio
+async def test_destroy_user_tokens(
+    database_strategy_extended: DatabaseStrategy[UserModel, IDType, AccessTokenModel],
+    access_token_database_extended: AccessTokenDatabaseExtendedMock,
+    user: UserModel,
+    superuser: UserModel,
+):
+    await access_token_database_extended.create({"token": "TOKEN1", "user_id": user.id})
+    await access_token_database_extended.create({"token": "TOKEN2", "user_id": user.id})
+    await access_token_database_extended.create(
+        {"token": "TOKEN3", "user_id": superuser.id}
+    )
+
+    await database_strategy_extended.destroy_user_tokens(user)
+
+    assert await access_token_database_extended.get_by_token("TOKEN1") is None
+    assert await access_token_database_extended.get_by_token("TOKEN2") is None
+    assert await access_token_database_extended.get_by_token("TOKEN3") is not None
+
+
+@pytest.mark.authentication
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "strategy_fixture", ["database_strategy", "database_strategy_structural"]
+)
+async def test_destroy_user_tokens_not_supported(
+    request: pytest.FixtureRequest, strategy_fixture: str, user: UserModel
+):
+    database_strategy: DatabaseStrategy[UserModel, IDType, AccessTokenModel] = (
+        request.getfixturevalue(strategy_fixture)
+    )
+
+    with pytest.raises(DatabaseStrategyDestroyNotSupportedError):
+        await database_strategy.destroy_user_tokens(user)
+
+
+@pytest.fixture
+def access_token_sweeper(
+    access_token_database_extended: AccessTokenDatabaseExtendedMock,
+) -> AccessTokenSweeper[AccessTokenModel]:
+    @contextlib.asynccontextmanager
+    async def get_database():
+        yield access_token_database_extended
+
+    return AccessTokenSweeper(get_database, 3600, batch_size=2, batch_delay=0)
+
+
+@pytest.mark.authentication
+class TestAccessTokenSweeper:
+    @pytest.mark.asyncio
+    async def test_sweep(
+        self,
+        access_token_sweeper: AccessTokenSweeper[AccessTokenModel],
+        access_token_database_extended: AccessTokenDatabaseExtendedMock,
+        user: UserModel,
+    ):
+        expired_at = datetime.now(timezone.utc) - timedelta(seconds=7200)
+        for i in range(5):
+            await access_token_database_extended.create(
+                {"token": f"EXPIRED{i}", "user_id": user.id, "created_at": expired_at}
+            )
+        await access_token_database_extended.create(
+            {"token": "TOKEN", "user_id": user.id}
+        )
+
+        deleted_count = await access_token_sweeper.sweep()
+
+        assert deleted_count == 5
+        assert access_token_sweeper.last_deleted_count == 5
+        assert access_token_sweeper.deleted_count == 5
+        assert list(access_token_database_extended.store.keys()) == ["TOKEN"]
+
+    @pytest.mark.asyncio
+    async def test_run_once(
+        self,
+        access_token_sweeper: AccessTokenSweeper[AccessTokenModel],
+    ):
+        await access_token_sweeper.run_once()
+
+        assert access_token_sweeper.last_deleted_count == 0
+
+
+@pytest.mark.authentication
+class TestHashTokens:
+    @pytest.fixture
+    def database_strategy_hashed(
+        self, access_token_database: AccessTokenDatabaseMock
+    ) -> DatabaseStrategy[UserModel, IDType, AccessTokenModel]:
+        return DatabaseStrategy(access_token_database, 3600, hash_tokens=True)
+
+    @pytest.mark.asyncio
+    async def test_write_read_destroy(
+        self,
+        database_strategy_hashed: DatabaseStrategy[UserModel, IDType, AccessTokenModel],
+        access_token_database: AccessTokenDatabaseMock,
+        user_manager,
+        user: UserModel,
+    ):
+        token = await database_strategy_hashed.write_token(user)
+
+        assert await access_token_database.get_by_token(token) is None
+        (stored_token,) = access_token_database.store.keys()
+        assert stored_token != token
+        assert len(stored_token) == 43
+
+        authenticated_user = await database_strategy_hashed.read_token(
+            token, user_manager
+        )
+        assert authenticated_user is not None
+        assert authenticated_user.id == user.id
+
+        assert (
+            await database_strategy_hashed.read_token(stored_token, user_manager)
+            is None
+        )
+
+        await database_strategy_hashed.destroy_token(token, user)
+        assert access_token_database.store == {}
+
+
+@pytest.fixture
+def access_token_last_used_tracker(
+    access_token_database_extended: AccessTokenDatabaseExtendedMock,
+) -> AccessTokenLastUsedTracker[AccessTokenModel]:
+    @contextlib.asynccontextmanager
+    async def get_database():
+        yield access_token_database_extended
+
+    return AccessTokenLastUsedTracker(get_database)
+
+
+@pytest.mark.authentication
+class TestAccessTokenLastUsedTracker:
+    @pytest.mark.asyncio
+    async def test_read_token(
+        self,
+        access_token_database_extended: AccessTokenDatabaseExtendedMock,
+        access_token_last_used_tracker: AccessTokenLastUsedTracker[AccessTokenModel],
+        user_manager,
+        user: UserModel,
+    ):
+        database_strategy = DatabaseStrategy(
+            access_token_database_extended,
+            3600,
+            last_used_tracker=access_token_last_used_tracker,
+        )
+        await access_token_database_extended.create(
+            {"token": "TOKEN", "user_id": user.id}
+        )
+
+        await database_strategy.read_token("TOKEN", user_manager)
+        await database_strategy.read_token("TOKEN", user_manager)
+        await database_strategy.read_token("INVALID_TOKEN", user_manager)
+        assert access_token_database_extended.last_used == {}
+
+        await access_token_last_used_tracker.run_once()
+        assert list(access_token_database_extended.last_used.keys()) == ["TOKEN"]
+        assert access_token_last_used_tracker.written_count == 1
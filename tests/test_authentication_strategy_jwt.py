@@ -136,6 +136,35 @@ class TestReadToken:
         assert authenticated_user.id == user.id
 
 
+@pytest.mark.parametrize("jwt_strategy", ["HS256", "RS256", "ES256"], indirect=True)
+@pytest.mark.authentication
+@pytest.mark.asyncio
+async def test_read_tokens(
+    jwt_strategy: JWTStrategy[UserModel, IDType],
+    token,
+    user_manager,
+    user: UserModel,
+    inactive_user: UserModel,
+):
+    users = await jwt_strategy.read_tokens(
+        [
+            token(user.id),
+            "foo",
+            token(),
+            token("foo"),
+            token(inactive_user.id),
+        ],
+        user_manager,
+    )
+    assert [u.id if u else None for u in users] == [
+        user.id,
+        None,
+        None,
+        None,
+        inactive_user.id,
+    ]
+
+
 @pytest.mark.parametrize("jwt_strategy", ["HS256", "RS256", "ES256"], indirect=True)
 @pytest.mark.authentication
 @pytest.mark.asyncio
@@ -28,6 +28,9 @@ class RedisMock:
             expiration = int(datetime.now().timestamp() + ex)
         self.store[key] = (value, expiration)
 
+    async def mget(self, keys: list[str]) -> list[str | None]:
+        return [await self.get(key) for key in keys]
+
     async def delete(self, key: str):
         try:
             del self.store[key]
@@ -99,6 +102,41 @@ class TestReadToken:
         assert authenticated_user.id == user.id
 
 
+@pytest.mark.authentication
+class TestReadTokens:
+    @pytest.mark.asyncio
+    async def test_empty(
+        self, redis_strategy: RedisStrategy[UserModel, IDType], user_manager
+    ):
+        assert await redis_strategy.read_tokens([], user_manager) == []
+
+    @pytest.mark.asyncio
+    async def test_read_tokens(
+        self,
+        redis_strategy: RedisStrategy[UserModel, IDType],
+        redis: RedisMock,
+        user_manager,
+        user,
+        inactive_user,
+    ):
+        await redis.set(f"{redis_strategy.key_prefix}TOKEN1", str(user.id))
+        await redis.set(f"{redis_strategy.key_prefix}TOKEN2", "bar")
+        await redis.set(f"{redis_strategy.key_prefix}TOKEN3", str(inactive_user.id))
+        await redis.set(f"{redis_strategy.key_prefix}TOKEN4", str(user.id))
+
+        users = await redis_strategy.read_tokens(
+            ["TOKEN1", "TOKEN2", "INVALID", "TOKEN3", "TOKEN4"], user_manager
+        )
+
+        assert [u.id if u else None for u in users] == [
+            user.id,
+            None,
+            None,
+            inactive_user.id,
+            user.id,
+        ]
+
+
 @pytest.mark.authentication
 @pytest.mark.asyncio
 async def test_write_token(
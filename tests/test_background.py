@@ -0,0 +1,262 @@
+import asyncio
+import contextlib
+from datetime import datetime
+
+import pytest
+
+from fastapi_users.background import BufferedBulkWriter, HookDispatcher, PeriodicTask
+
+
+class CounterTask(PeriodicTask):
+    def __init__(self, fail: bool = False, lock=None):
+        super().__init__(interval=0, lock=lock)
+        self.fail = fail
+        self.count = 0
+
+    async def run(self) -> None:
+        self.count += 1
+        if self.fail:
+            raise RuntimeError()
+
+
+@pytest.mark.background
+@pytest.mark.asyncio
+async def test_periodic_task():
+    task = CounterTask()
+    async with task:
+        assert task.running
+        await asyncio.sleep(0.01)
+
+    assert not task.running
+    assert task.count > 0
+
+
+@pytest.mark.background
+@pytest.mark.asyncio
+async def test_periodic_task_start_twice():
+    task = CounterTask()
+    await task.start()
+    running_task = task._task
+    await task.start()
+    assert task._task is running_task
+    await task.stop()
+    await task.stop()
+
+
+@pytest.mark.background
+@pytest.mark.asyncio
+async def test_periodic_task_run_once():
+    task = CounterTask()
+    await task.run_once()
+    assert task.count == 1
+
+
+@pytest.mark.background
+@pytest.mark.asyncio
+@pytest.mark.parametrize("acquired,expected_count", [(True, 1), (False, 0)])
+async def test_periodic_task_lock(acquired: bool, expected_count: int):
+    @contextlib.asynccontextmanager
+    async def lock():
+        yield acquired
+
+    task = CounterTask(lock=lock)
+    await task.run_once()
+    assert task.count == expected_count
+
+
+@pytest.mark.background
+@pytest.mark.asyncio
+async def test_periodic_task_error():
+    task = CounterTask(fail=True)
+    async with task:
+        await asyncio.sleep(0.01)
+
+    assert task.count > 1
+
+
+class BatchRecorder:
+    def __init__(self, failures: int = 0, block: bool = False):
+        self.failures = failures
+        self.block = block
+        self.started = asyncio.Event()
+        self.batches: list[dict[str, datetime]] = []
+
+    async def __call__(self, batch: dict[str, datetime]) -> None:
+        if self.block:
+            self.block = False
+            self.started.set()
+            await asyncio.sleep(3600)
+        if self.failures > 0:
+            self.failures -= 1
+            raise RuntimeError()
+        self.batches.append(batch)
+
+
+@pytest.mark.background
+@pytest.mark.asyncio
+class TestBufferedBulkWriter:
+    async def test_run_once(self):
+        write = BatchRecorder()
+        writer = BufferedBulkWriter(write)
+        writer.touch("KEY")
+        first_date = writer._buffer["KEY"]
+        writer.touch("KEY")
+        assert write.batches == []
+
+        await writer.run_once()
+        assert list(write.batches[0].keys()) == ["KEY"]
+        assert write.batches[0]["KEY"] >= first_date
+        assert writer.written_count == 1
+
+    async def test_max_size(self):
+        write = BatchRecorder()
+        writer = BufferedBulkWriter(write, max_size=2)
+        writer.touch("KEY1")
+        writer.touch("KEY2")
+        writer.touch("KEY3")
+        writer.touch("KEY1")
+
+        await writer.flush()
+        assert set(write.batches[0].keys()) == {"KEY1", "KEY2"}
+        assert writer.dropped_count == 1
+
+    async def test_flush_on_stop(self):
+        write = BatchRecorder()
+        async with BufferedBulkWriter(write) as writer:
+            writer.touch("KEY")
+
+        assert list(write.batches[0].keys()) == ["KEY"]
+
+    async def test_flush_empty(self):
+        write = BatchRecorder()
+        writer = BufferedBulkWriter(write)
+
+        await writer.flush()
+
+        assert write.batches == []
+
+    async def test_flush_error(self):
+        write = BatchRecorder(failures=1)
+        writer = BufferedBulkWriter(write)
+        writer.touch("KEY")
+
+        with pytest.raises(RuntimeError):
+            await writer.flush()
+
+        assert writer.written_count == 0
+        assert list(writer._buffer.keys()) == ["KEY"]
+
+    async def test_flush_cancelled_on_stop(self):
+        write = BatchRecorder(block=True)
+        writer = BufferedBulkWriter(write, interval=0)
+        writer.touch("KEY")
+
+        await writer.start()
+        await write.started.wait()
+        await writer.stop()
+
+        assert list(write.batches[0].keys()) == ["KEY"]
+        assert writer.written_count == 1
+
+
+class HookRecorder:
+    def __init__(self, failures: int = 0, delay: float = 0):
+        self.failures = failures
+        self.delay = delay
+        self.calls: list[tuple] = []
+
+    async def __call__(self, *args) -> None:
+        await asyncio.sleep(self.delay)
+        self.calls.append(args)
+        if len(self.calls) <= self.failures:
+            raise RuntimeError()
+
+
+@pytest.mark.background
+class TestHookDispatcher:
+    @pytest.mark.asyncio
+    async def test_not_running(self):
+        dispatcher = HookDispatcher({"on_after_register"})
+        hook = HookRecorder()
+
+        await dispatcher.dispatch("on_after_register", hook, "USER")
+
+        assert hook.calls == [("USER",)]
+        assert dispatcher.processed_count == 0
+
+    @pytest.mark.asyncio
+    async def test_inline_hook(self):
+        hook = HookRecorder(failures=1)
+        async with HookDispatcher({"on_after_register"}) as dispatcher:
+            with pytest.raises(RuntimeError):
+                await dispatcher.dispatch("on_after_update", hook, "USER")
+
+    @pytest.mark.asyncio
+    async def test_background_hook(self):
+        hook = HookRecorder(delay=0.01)
+        async with HookDispatcher({"on_after_register"}, workers=2) as dispatcher:
+            assert dispatcher.running
+            for i in range(3):
+                await dispatcher.dispatch("on_after_register", hook, i)
+            assert hook.calls == []
+
+        assert not dispatcher.running
+        assert sorted(hook.calls) == [(0,), (1,), (2,)]
+        assert dispatcher.processed_count == 3
+        assert dispatcher.pending_count == 0
+
+    @pytest.mark.asyncio
+    async def test_retries(self):
+        hook = HookRecorder(failures=2)
+        async with HookDispatcher(
+            {"on_after_register"}, max_retries=2, retry_delay=0
+        ) as dispatcher:
+            await dispatcher.dispatch("on_after_register", hook, "USER")
+
+        assert len(hook.calls) == 3
+        assert dispatcher.processed_count == 1
+        assert dispatcher.failed_count == 0
+
+    @pytest.mark.asyncio
+    async def test_retries_exhausted(self):
+        hook = HookRecorder(failures=10)
+        async with HookDispatcher(
+            {"on_after_register"}, max_retries=2, retry_delay=0
+        ) as dispatcher:
+            await dispatcher.dispatch("on_after_register", hook, "USER")
+
+        assert len(hook.calls) == 3
+        assert dispatcher.processed_count == 0
+        assert dispatcher.failed_count == 1
+
+    @pytest.mark.asyncio
+    async def test_backpressure(self):
+        hook = HookRecorder(delay=0.05)
+        async with HookDispatcher(
+            {"on_after_register"}, workers=1, max_queue_size=1
+        ) as dispatcher:
+            await dispatcher.dispatch("on_after_register", hook, 0)
+            await asyncio.sleep(0)
+            await dispatcher.dispatch("on_after_register", hook, 1)
+            assert dispatcher.pending_count == 1
+
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(
+                    dispatcher.dispatch("on_after_register", hook, 2), 0.01
+                )
+
+    @pytest.mark.asyncio
+    async def test_drain_timeout(self):
+        hook = HookRecorder(delay=10)
+        dispatcher = HookDispatcher(
+            {"on_after_register"}, workers=1, drain_timeout=0.01
+        )
+        await dispatcher.start()
+        await dispatcher.start()
+        await dispatcher.dispatch("on_after_register", hook, 0)
+        await dispatcher.dispatch("on_after_register", hook, 1)
+        await dispatcher.stop()
+        await dispatcher.stop()
+
+        assert not dispatcher.running
+        assert hook.calls == []
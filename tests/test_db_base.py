@@ -1,4 +1,5 @@
 import uuid
+from datetime import datetime, timezone
 
 import pytest
 
@@ -16,18 +17,33 @@ async def test_not_implemented_methods(
     with pytest.raises(NotImplementedError):
         await base_user_db.get(uuid.uuid4())
 
+    with pytest.raises(NotImplementedError):
+        await base_user_db.get_many([uuid.uuid4()])
+
     with pytest.raises(NotImplementedError):
         await base_user_db.get_by_email("lancelot@camelot.bt")
 
+    with pytest.raises(NotImplementedError):
+        await base_user_db.get_many_by_email(["lancelot@camelot.bt"])
+
     with pytest.raises(NotImplementedError):
         await base_user_db.get_by_oauth_account("google", "user_oauth1")
 
     with pytest.raises(NotImplementedError):
         await base_user_db.create({})
 
+    with pytest.raises(NotImplementedError):
+        await base_user_db.create_many([{}])
+
+    with pytest.raises(NotImplementedError):
+        await base_user_db.create_unique({})
+
     with pytest.raises(NotImplementedError):
         await base_user_db.update(user, {})
 
+    with pytest.raises(NotImplementedError):
+        await base_user_db.update_unique(user, {})
+
     with pytest.raises(NotImplementedError):
         await base_user_db.delete(user)
 
@@ -36,3 +52,39 @@ async def test_not_implemented_methods(
 
     with pytest.raises(NotImplementedError):
         await base_user_db.update_oauth_account(user, oauth_account1, {})
+
+    with pytest.raises(NotImplementedError):
+        await base_user_db.upsert_oauth_user({}, {}, False)
+
+    with pytest.raises(NotImplementedError):
+        await base_user_db.get_expiring_oauth_accounts(0, None, 10)
+
+    with pytest.raises(NotImplementedError):
+        await base_user_db.update_last_login({user.id: datetime.now(timezone.utc)})
+
+    with pytest.raises(NotImplementedError):
+        await base_user_db.list(None, 10, {})
+
+
+@pytest.mark.asyncio
+@pytest.mark.db
+async def test_get_many_fallback(
+    mock_user_db: BaseUserDatabase[UserModel, IDType],
+    user: UserModel,
+    inactive_user: UserModel,
+):
+    users = await mock_user_db.get_many([user.id, uuid.uuid4(), inactive_user.id])
+    assert [u.id for u in users] == [user.id, inactive_user.id]
+
+
+@pytest.mark.asyncio
+@pytest.mark.db
+async def test_get_many_by_email_fallback(
+    mock_user_db: BaseUserDatabase[UserModel, IDType],
+    user: UserModel,
+    inactive_user: UserModel,
+):
+    users = await mock_user_db.get_many_by_email(
+        [user.email, "lancelot@camelot.bt", inactive_user.email]
+    )
+    assert [u.id for u in users] == [user.id, inactive_user.id]
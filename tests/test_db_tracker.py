@@ -0,0 +1,35 @@
+import contextlib
+import uuid
+from datetime import datetime
+
+import pytest
+
+from fastapi_users.db import BaseUserDatabase, LastLoginTracker
+from tests.conftest import IDType, UserModel
+
+
+class UserDatabaseMock(BaseUserDatabase[UserModel, IDType]):
+    def __init__(self):
+        self.last_logins: dict[IDType, datetime] = {}
+
+    async def update_last_login(self, last_logins: dict[IDType, datetime]) -> None:
+        self.last_logins.update(last_logins)
+
+
+@pytest.mark.db
+@pytest.mark.asyncio
+async def test_last_login_tracker():
+    user_database = UserDatabaseMock()
+
+    @contextlib.asynccontextmanager
+    async def get_database():
+        yield user_database
+
+    last_login_tracker = LastLoginTracker(get_database)
+    user_id = uuid.uuid4()
+    last_login_tracker.touch(user_id)
+    assert user_database.last_logins == {}
+
+    await last_login_tracker.run_once()
+    assert list(user_database.last_logins.keys()) == [user_id]
+    assert last_login_tracker.written_count == 1
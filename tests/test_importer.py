@@ -0,0 +1,263 @@
+import contextlib
+import json
+import sys
+from collections.abc import AsyncGenerator
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import pytest
+from pytest_mock import MockerFixture
+
+from fastapi_users import exceptions
+from fastapi_users.importer import UserImporter, main
+from fastapi_users.password import PasswordHelper
+from tests.conftest import UserManagerMock, UserModel
+
+password_helper = PasswordHelper()
+
+
+@pytest.mark.asyncio
+@pytest.mark.manager
+class TestImportUsers:
+    async def test_import_users(
+        self, user_manager: UserManagerMock[UserModel], user: UserModel
+    ):
+        argon2_hash = password_helper.hash("guinevere")
+        records: list[Any] = [
+            {"email": "lancelot@camelot.bt", "password": "guinevere"},
+            {"email": "galahad@camelot.bt", "hashed_password": argon2_hash},
+            {"email": "bedivere@camelot.bt", "hashed_password": "md5$grail"},
+            {"password": "guinevere"},
+            {"email": "bors@camelot.bt"},
+            {
+                "email": "gawain@camelot.bt",
+                "password": "guinevere",
+                "hashed_password": argon2_hash,
+            },
+            {"email": "LANCELOT@camelot.bt", "password": "guinevere"},
+            {"email": user.email.upper(), "password": "guinevere"},
+            {"email": "tristan@camelot.bt", "password": "isolde", "first_name": "T"},
+            ["percival@camelot.bt", "guinevere"],
+        ]
+
+        importer = UserImporter(user_manager)
+        results = [result async for result in importer.import_users(records)]
+
+        assert [result.index for result in results] == list(range(len(records)))
+        assert [result.ok for result in results] == [
+            True,
+            True,
+            False,
+            False,
+            False,
+            False,
+            False,
+            False,
+            True,
+            False,
+        ]
+
+        lancelot = results[0].user
+        assert lancelot is not None
+        assert lancelot.email == "lancelot@camelot.bt"
+        assert password_helper.verify_and_update("guinevere", lancelot.hashed_password)[
+            0
+        ]
+
+        galahad = results[1].user
+        assert galahad is not None
+        assert galahad.hashed_password == argon2_hash
+
+        assert isinstance(results[2].error, exceptions.InvalidImportRecord)
+        assert isinstance(results[3].error, exceptions.InvalidImportRecord)
+        assert results[3].email is None
+        assert isinstance(results[4].error, exceptions.InvalidImportRecord)
+        assert isinstance(results[5].error, exceptions.InvalidImportRecord)
+        assert isinstance(results[6].error, exceptions.UserAlreadyExists)
+        assert isinstance(results[7].error, exceptions.UserAlreadyExists)
+
+        tristan = results[8].user
+        assert tristan is not None
+        assert tristan.first_name == "T"
+
+        assert isinstance(results[9].error, exceptions.InvalidImportRecord)
+        assert results[9].email is None
+
+    async def test_batches(
+        self, user_manager: UserManagerMock[UserModel], mocker: MockerFixture
+    ):
+        get_many_by_email_spy = mocker.spy(user_manager, "get_many_by_email")
+        create_spy = mocker.spy(user_manager.user_db, "create")
+
+        async def records() -> AsyncGenerator[dict[str, Any], None]:
+            for i in range(5):
+                yield {"email": f"knight{i}@camelot.bt", "password": "guinevere"}
+
+        importer = UserImporter(user_manager, batch_size=2)
+        results = [result async for result in importer.import_users(records())]
+
+        assert all(result.ok for result in results)
+        assert [result.email for result in results] == [
+            f"knight{i}@camelot.bt" for i in range(5)
+        ]
+        assert get_many_by_email_spy.call_count == 3
+        assert create_spy.call_count == 5
+
+    async def test_nothing_to_create(
+        self, user_manager: UserManagerMock[UserModel], mocker: MockerFixture
+    ):
+        create_spy = mocker.spy(user_manager.user_db, "create")
+
+        importer = UserImporter(user_manager)
+        results = [result async for result in importer.import_users([{}])]
+
+        assert isinstance(results[0].error, exceptions.InvalidImportRecord)
+        create_spy.assert_not_called()
+
+    async def test_create_many(
+        self, user_manager: UserManagerMock[UserModel], mocker: MockerFixture
+    ):
+        user_db = user_manager.user_db
+
+        async def create_many(create_dicts):
+            return [await user_db.create(create_dict) for create_dict in create_dicts]
+
+        mocker.patch.object(user_db, "create_many", side_effect=create_many)
+        create_spy = mocker.spy(user_db, "create")
+        records = [
+            {"email": f"knight{i}@camelot.bt", "password": "guinevere"}
+            for i in range(3)
+        ]
+
+        importer = UserImporter(user_manager)
+        results = [result async for result in importer.import_users(records)]
+
+        assert all(result.ok for result in results)
+        assert create_spy.call_count == 3
+
+    @pytest.mark.parametrize("implemented", [True, False])
+    async def test_database_error(
+        self,
+        user_manager: UserManagerMock[UserModel],
+        mocker: MockerFixture,
+        implemented: bool,
+    ):
+        if implemented:
+            mocker.patch.object(
+                user_manager.user_db, "create_many", side_effect=RuntimeError()
+            )
+        else:
+            mocker.patch.object(
+                user_manager.user_db, "create", side_effect=RuntimeError()
+            )
+        records = [{"email": "lancelot@camelot.bt", "password": "guinevere"}]
+
+        importer = UserImporter(user_manager)
+        with pytest.raises(RuntimeError):
+            [result async for result in importer.import_users(records)]
+
+    async def test_executor(self, user_manager: UserManagerMock[UserModel]):
+        records = [
+            {"email": f"knight{i}@camelot.bt", "password": "guinevere"}
+            for i in range(3)
+        ]
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            importer = UserImporter(user_manager, executor=executor)
+            results = [result async for result in importer.import_users(records)]
+
+        assert all(result.ok for result in results)
+
+
+@pytest.mark.manager
+class TestCLI:
+    @pytest.fixture(autouse=True)
+    def get_user_manager_context(
+        self, user_manager: UserManagerMock[UserModel], monkeypatch
+    ):
+        @contextlib.asynccontextmanager
+        async def _get_user_manager_context():
+            yield user_manager
+
+        monkeypatch.setattr(
+            sys.modules[__name__],
+            "get_user_manager_context",
+            _get_user_manager_context,
+            raising=False,
+        )
+
+    def test_import(self, tmp_path, capsys):
+        file = tmp_path / "users.ndjson"
+        file.write_text(
+            "\n".join(
+                json.dumps(record)
+                for record in [
+                    {"email": "lancelot@camelot.bt", "password": "guinevere"},
+                    {"email": "galahad@camelot.bt", "password": "guinevere"},
+                ]
+            )
+            + "\n\n"
+        )
+
+        exit_code = main([f"{__name__}:get_user_manager_context", str(file)])
+
+        assert exit_code == 0
+        captured = capsys.readouterr()
+        assert captured.out == ""
+        assert "2 users imported, 0 failed." in captured.err
+
+    def test_errors(self, tmp_path, capsys):
+        file = tmp_path / "users.ndjson"
+        file.write_text(
+            "\n".join(
+                json.dumps(record)
+                for record in [
+                    {"email": "lancelot@camelot.bt", "password": "guinevere"},
+                    {"email": "lancelot@camelot.bt", "password": "guinevere"},
+                    {"email": "galahad@camelot.bt"},
+                ]
+            )
+            + "\n{not json"
+        )
+
+        exit_code = main(
+            [
+                f"{__name__}:get_user_manager_context",
+                str(file),
+                "--batch-size",
+                "10",
+                "--workers",
+                "2",
+            ]
+        )
+
+        assert exit_code == 1
+        captured = capsys.readouterr()
+        errors = [json.loads(line) for line in captured.out.splitlines()]
+        assert errors == [
+            {
+                "index": 1,
+                "email": "lancelot@camelot.bt",
+                "error": "UserAlreadyExists",
+            },
+            {
+                "index": 2,
+                "email": "galahad@camelot.bt",
+                "error": "InvalidImportRecord",
+                "reason": "Exactly one of password or hashed_password is required.",
+            },
+            {
+                "index": 3,
+                "email": None,
+                "error": "InvalidImportRecord",
+                "reason": "Record is not a mapping.",
+            },
+        ]
+        assert "1 users imported, 3 failed." in captured.err
+
+    def test_invalid_user_manager_path(self, tmp_path):
+        file = tmp_path / "users.ndjson"
+        file.write_text("")
+
+        with pytest.raises(SystemExit):
+            main(["get_user_manager_context", str(file)])
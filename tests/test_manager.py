@@ -5,6 +5,8 @@ import pytest
 from fastapi.security import OAuth2PasswordRequestForm
 from pytest_mock import MockerFixture
 
+from fastapi_users.background import HookDispatcher
+from fastapi_users.db import LastLoginTracker
 from fastapi_users.exceptions import (
     InvalidID,
     InvalidPasswordException,
@@ -12,6 +14,7 @@ from fastapi_users.exceptions import (
     InvalidVerifyToken,
     UserAlreadyExists,
     UserAlreadyVerified,
+    UserEmailConflict,
     UserInactive,
     UserNotExists,
 )
@@ -100,6 +103,146 @@ class TestGetByEmail:
         assert retrieved_user.id == user.id
 
 
+@pytest.mark.asyncio
+@pytest.mark.manager
+class TestGetMany:
+    async def test_empty(self, user_manager: UserManagerMock[UserModel]):
+        assert await user_manager.get_many([]) == []
+
+    async def test_get_many(
+        self,
+        user_manager: UserManagerMock[UserModel],
+        user: UserModel,
+        superuser: UserModel,
+    ):
+        not_existing_id = uuid.UUID("d35d213e-f3d8-4f08-954a-7e0d1bea286f")
+        users = await user_manager.get_many(
+            [superuser.id, not_existing_id, user.id, superuser.id]
+        )
+        assert [u.id if u else None for u in users] == [
+            superuser.id,
+            None,
+            user.id,
+            superuser.id,
+        ]
+
+
+@pytest.mark.asyncio
+@pytest.mark.manager
+class TestGetManyByEmail:
+    async def test_empty(self, user_manager: UserManagerMock[UserModel]):
+        assert await user_manager.get_many_by_email([]) == []
+
+    async def test_get_many_by_email(
+        self,
+        user_manager: UserManagerMock[UserModel],
+        user: UserModel,
+        superuser: UserModel,
+    ):
+        users = await user_manager.get_many_by_email(
+            [superuser.email, "lancelot@camelot.bt", user.email.upper()]
+        )
+        assert [u.id if u else None for u in users] == [superuser.id, None, user.id]
+
+
+@pytest.mark.asyncio
+@pytest.mark.manager
+class TestList:
+    async def test_list(self, user_manager: UserManagerMock[UserModel], mock_user_db):
+        all_users = await mock_user_db.list(None, 100, {})
+
+        users = await user_manager.list()
+        assert users == all_users
+
+        users = await user_manager.list(all_users[1].id, 2)
+        assert users == all_users[2:4]
+
+    async def test_filters(
+        self,
+        user_manager: UserManagerMock[UserModel],
+        inactive_user: UserModel,
+    ):
+        users = await user_manager.list(filters={"is_active": False})
+        assert users == [inactive_user]
+
+
+@pytest.mark.asyncio
+@pytest.mark.manager
+class TestExport:
+    @pytest.mark.parametrize("batch_size,queries", [(2, 3), (5, 2), (1000, 1)])
+    async def test_export(
+        self,
+        user_manager: UserManagerMock[UserModel],
+        mock_user_db,
+        mocker: MockerFixture,
+        batch_size: int,
+        queries: int,
+    ):
+        all_users = await mock_user_db.list(None, 100, {})
+        list_spy = mocker.spy(mock_user_db, "list")
+
+        users = [user async for user in user_manager.export(batch_size)]
+
+        assert users == all_users
+        assert list_spy.call_count == queries
+
+    async def test_filters(
+        self,
+        user_manager: UserManagerMock[UserModel],
+        inactive_user: UserModel,
+    ):
+        users = [
+            user async for user in user_manager.export(filters={"is_active": False})
+        ]
+        assert users == [inactive_user]
+
+
+@pytest.mark.asyncio
+@pytest.mark.manager
+class TestTriggerHook:
+    async def test_inline(self, user_manager: UserManagerMock[UserModel], user):
+        await user_manager.trigger_hook("on_after_register", user, None)
+        user_manager.on_after_register.assert_called_once_with(user, None)
+
+    async def test_hook_dispatcher(
+        self, user_manager: UserManagerMock[UserModel], user, mocker: MockerFixture
+    ):
+        hook_dispatcher = HookDispatcher({"on_after_register"})
+        dispatch_spy = mocker.spy(hook_dispatcher, "dispatch")
+        user_manager.hook_dispatcher = hook_dispatcher
+
+        async with hook_dispatcher:
+            created_user = await user_manager.create(
+                UserCreate(email="lancelot@camelot.bt", password="guinevere")
+            )
+
+        dispatch_spy.assert_called_once_with(
+            "on_after_register",
+            user_manager.on_after_register,
+            created_user,
+            None,
+        )
+        user_manager.on_after_register.assert_called_once_with(created_user, None)
+        assert hook_dispatcher.processed_count == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.manager
+class TestTrackLogin:
+    async def test_no_tracker(self, user_manager: UserManagerMock[UserModel], user):
+        user_manager.track_login(user)
+
+    async def test_tracker(
+        self, user_manager: UserManagerMock[UserModel], user, mocker: MockerFixture
+    ):
+        last_login_tracker = LastLoginTracker(mocker.MagicMock())
+        user_manager.last_login_tracker = last_login_tracker
+
+        user_manager.track_login(user)
+
+        assert list(last_login_tracker._buffer.keys()) == [user.id]
+
+
 @pytest.mark.asyncio
 @pytest.mark.manager
 class TestGetByOAuthAccount:
@@ -133,6 +276,16 @@ class TestCreateUser:
             await user_manager.create(user)
         assert user_manager.on_after_register.called is False
 
+    async def test_existing_user_password_not_hashed(
+        self, user_manager: UserManagerMock[UserModel], mocker: MockerFixture
+    ):
+        hash_spy = mocker.spy(user_manager.password_helper, "hash")
+
+        user = UserCreate(email="king.arthur@camelot.bt", password="guinevere")
+        with pytest.raises(UserAlreadyExists):
+            await user_manager.create(user)
+        hash_spy.assert_not_called()
+
     @pytest.mark.parametrize("email", ["lancelot@camelot.bt", "Lancelot@camelot.bt"])
     async def test_regular_user(
         self, email: str, user_manager: UserManagerMock[UserModel]
@@ -169,6 +322,36 @@ class TestCreateUser:
 
         assert user_manager.on_after_register.called is True
 
+    async def test_create_unique(
+        self, user_manager: UserManagerMock[UserModel], mocker: MockerFixture
+    ):
+        create_unique = mocker.patch.object(
+            user_manager.user_db,
+            "create_unique",
+            side_effect=lambda create_dict: UserModel(**create_dict),
+        )
+        get_by_email_spy = mocker.spy(user_manager.user_db, "get_by_email")
+
+        user = UserCreate(email="lancelot@camelot.bt", password="guinevere")
+        created_user = await user_manager.create(user)
+
+        assert created_user.email == "lancelot@camelot.bt"
+        create_unique.assert_called_once()
+        get_by_email_spy.assert_not_called()
+        assert user_manager.on_after_register.called is True
+
+    async def test_create_unique_conflict(
+        self, user_manager: UserManagerMock[UserModel], mocker: MockerFixture
+    ):
+        mocker.patch.object(
+            user_manager.user_db, "create_unique", side_effect=UserEmailConflict()
+        )
+
+        user = UserCreate(email="lancelot@camelot.bt", password="guinevere")
+        with pytest.raises(UserAlreadyExists):
+            await user_manager.create(user)
+        assert user_manager.on_after_register.called is False
+
 
 @pytest.mark.asyncio
 @pytest.mark.manager
@@ -197,11 +380,62 @@ class TestOAuthCallback:
 
         assert user_manager_oauth.on_after_register.called is False
 
+    async def test_existing_user_with_oauth_unchanged(
+        self,
+        user_manager_oauth: UserManagerMock[UserOAuthModel],
+        user_oauth: UserOAuthModel,
+        mocker: MockerFixture,
+    ):
+        update_oauth_account_spy = mocker.spy(
+            user_manager_oauth.user_db, "update_oauth_account"
+        )
+        oauth_account = user_oauth.oauth_accounts[0]
+
+        user = await user_manager_oauth.oauth_callback(
+            oauth_account.oauth_name,
+            oauth_account.access_token,
+            oauth_account.account_id,
+            oauth_account.account_email,
+            oauth_account.expires_at,
+            oauth_account.refresh_token,
+        )
+
+        assert user.id == user_oauth.id
+        update_oauth_account_spy.assert_not_called()
+
+    async def test_existing_user_with_oauth_only_changes(
+        self,
+        user_manager_oauth: UserManagerMock[UserOAuthModel],
+        user_oauth: UserOAuthModel,
+        mocker: MockerFixture,
+    ):
+        update_oauth_account_spy = mocker.spy(
+            user_manager_oauth.user_db, "update_oauth_account"
+        )
+        oauth_account = user_oauth.oauth_accounts[0]
+
+        await user_manager_oauth.oauth_callback(
+            oauth_account.oauth_name,
+            "UPDATED_TOKEN",
+            oauth_account.account_id,
+            oauth_account.account_email,
+            oauth_account.expires_at,
+            oauth_account.refresh_token,
+        )
+
+        update_oauth_account_spy.assert_called_once_with(
+            user_oauth, oauth_account, {"access_token": "UPDATED_TOKEN"}
+        )
+
     async def test_existing_user_without_oauth_associate(
         self,
         user_manager_oauth: UserManagerMock[UserOAuthModel],
         superuser_oauth: UserOAuthModel,
+        mocker: MockerFixture,
     ):
+        hash_spy = mocker.spy(user_manager_oauth.password_helper, "hash")
+        get_by_email_spy = mocker.spy(user_manager_oauth.user_db, "get_by_email")
+
         user = await user_manager_oauth.oauth_callback(
             "service1",
             "TOKEN",
@@ -214,6 +448,8 @@ class TestOAuthCallback:
         assert user.id == superuser_oauth.id
         assert len(user.oauth_accounts) == 1
         assert user.oauth_accounts[0].id is not None
+        hash_spy.assert_not_called()
+        get_by_email_spy.assert_called_once()
 
         assert user_manager_oauth.on_after_register.called is False
 
@@ -232,6 +468,109 @@ class TestOAuthCallback:
                 associate_by_email=False,
             )
 
+    async def test_existing_user_without_oauth_associate_create_unique(
+        self,
+        user_manager_oauth: UserManagerMock[UserOAuthModel],
+        superuser_oauth: UserOAuthModel,
+        mocker: MockerFixture,
+    ):
+        mocker.patch.object(
+            user_manager_oauth.user_db,
+            "create_unique",
+            side_effect=UserEmailConflict(),
+        )
+
+        user = await user_manager_oauth.oauth_callback(
+            "service1",
+            "TOKEN",
+            "superuser_oauth1",
+            superuser_oauth.email,
+            1579000751,
+            associate_by_email=True,
+        )
+
+        assert user.id == superuser_oauth.id
+        assert len(user.oauth_accounts) == 1
+        assert user_manager_oauth.on_after_register.called is False
+
+    async def test_existing_user_without_oauth_no_associate_create_unique(
+        self,
+        user_manager_oauth: UserManagerMock[UserOAuthModel],
+        superuser_oauth: UserOAuthModel,
+        mocker: MockerFixture,
+    ):
+        mocker.patch.object(
+            user_manager_oauth.user_db,
+            "create_unique",
+            side_effect=UserEmailConflict(),
+        )
+
+        with pytest.raises(UserAlreadyExists):
+            await user_manager_oauth.oauth_callback(
+                "service1",
+                "TOKEN",
+                "superuser_oauth1",
+                superuser_oauth.email,
+                1579000751,
+                associate_by_email=False,
+            )
+
+    @pytest.mark.parametrize("created", [True, False])
+    async def test_upsert_oauth_user(
+        self,
+        user_manager_oauth: UserManagerMock[UserOAuthModel],
+        user_oauth: UserOAuthModel,
+        mocker: MockerFixture,
+        created: bool,
+    ):
+        upsert_oauth_user = mocker.patch.object(
+            user_manager_oauth.user_db,
+            "upsert_oauth_user",
+            return_value=(user_oauth, created),
+        )
+        add_oauth_account_spy = mocker.spy(
+            user_manager_oauth.user_db, "add_oauth_account"
+        )
+
+        user = await user_manager_oauth.oauth_callback(
+            "service1",
+            "TOKEN",
+            "new_user_oauth1",
+            "galahad@camelot.bt",
+            1579000751,
+            associate_by_email=True,
+        )
+
+        assert user is user_oauth
+        upsert_oauth_user.assert_called_once()
+        oauth_account_dict, user_dict, associate_by_email = (
+            upsert_oauth_user.call_args.args
+        )
+        assert oauth_account_dict["account_id"] == "new_user_oauth1"
+        assert user_dict["email"] == "galahad@camelot.bt"
+        assert "hashed_password" in user_dict
+        assert associate_by_email is True
+        add_oauth_account_spy.assert_not_called()
+
+        assert user_manager_oauth.on_after_register.called is created
+
+    async def test_upsert_oauth_user_conflict(
+        self,
+        user_manager_oauth: UserManagerMock[UserOAuthModel],
+        mocker: MockerFixture,
+    ):
+        mocker.patch.object(
+            user_manager_oauth.user_db,
+            "upsert_oauth_user",
+            side_effect=UserEmailConflict(),
+        )
+
+        with pytest.raises(UserAlreadyExists):
+            await user_manager_oauth.oauth_callback(
+                "service1", "TOKEN", "new_user_oauth1", "galahad@camelot.bt"
+            )
+        assert user_manager_oauth.on_after_register.called is False
+
     async def test_new_user(self, user_manager_oauth: UserManagerMock[UserOAuthModel]):
         user = await user_manager_oauth.oauth_callback(
             "service1", "TOKEN", "new_user_oauth1", "galahad@camelot.bt", 1579000751
@@ -638,6 +977,80 @@ class TestUpdateUser:
 
         assert user_manager.on_after_update.called is True
 
+    async def test_no_changes(
+        self,
+        user: UserModel,
+        user_manager: UserManagerMock[UserModel],
+        mocker: MockerFixture,
+    ):
+        update_spy = mocker.spy(user_manager.user_db, "update")
+
+        user_update = UserUpdate(
+            email=user.email, first_name=user.first_name, is_active=user.is_active
+        )
+        updated_user = await user_manager.update(user_update, user, safe=False)
+
+        assert updated_user is user
+        update_spy.assert_not_called()
+        user_manager.on_after_update.assert_called_once_with(user, {}, None)
+
+    async def test_only_changes(
+        self,
+        user: UserModel,
+        user_manager: UserManagerMock[UserModel],
+        mocker: MockerFixture,
+    ):
+        update_spy = mocker.spy(user_manager.user_db, "update")
+
+        user_update = UserUpdate(
+            email=user.email, first_name="Arthur", is_active=user.is_active
+        )
+        updated_user = await user_manager.update(user_update, user, safe=False)
+
+        update_spy.assert_called_once_with(user, {"first_name": "Arthur"})
+        user_manager.on_after_update.assert_called_once_with(
+            updated_user, {"first_name": "Arthur"}, None
+        )
+
+    async def test_email_update_update_unique(
+        self,
+        user: UserModel,
+        user_manager: UserManagerMock[UserModel],
+        mocker: MockerFixture,
+    ):
+        update_unique = mocker.patch.object(
+            user_manager.user_db,
+            "update_unique",
+            side_effect=user_manager.user_db.update,
+        )
+        get_by_email_spy = mocker.spy(user_manager.user_db, "get_by_email")
+
+        user_update = UserUpdate(email="lancelot@camelot.bt")
+        updated_user = await user_manager.update(user_update, user, safe=True)
+
+        assert updated_user.email == "lancelot@camelot.bt"
+        assert updated_user.is_verified is False
+        update_unique.assert_called_once()
+        get_by_email_spy.assert_not_called()
+
+        assert user_manager.on_after_update.called is True
+
+    async def test_email_update_update_unique_conflict(
+        self,
+        user: UserModel,
+        user_manager: UserManagerMock[UserModel],
+        mocker: MockerFixture,
+    ):
+        mocker.patch.object(
+            user_manager.user_db, "update_unique", side_effect=UserEmailConflict()
+        )
+
+        user_update = UserUpdate(email="lancelot@camelot.bt")
+        with pytest.raises(UserAlreadyExists):
+            await user_manager.update(user_update, user, safe=True)
+
+        assert user_manager.on_after_update.called is False
+
 
 @pytest.mark.asyncio
 @pytest.mark.manager
@@ -0,0 +1,256 @@
+import contextlib
+import time
+import uuid
+from typing import Any
+
+import httpx
+import pytest
+from httpx_oauth.oauth2 import BaseOAuth2, OAuth2, OAuth2Token, RefreshTokenError
+from pytest_mock import MockerFixture
+
+from fastapi_users.db import BaseUserDatabase
+from fastapi_users.oauth import (
+    OAuthTokenRefresher,
+    create_oauth_http_client,
+    with_http_client,
+)
+from tests.conftest import IDType, OAuthAccountModel, UserOAuthModel
+
+
+@pytest.mark.oauth
+@pytest.mark.asyncio
+async def test_create_oauth_http_client():
+    async with create_oauth_http_client(timeout=5, max_connections=10) as http_client:
+        assert http_client.timeout == httpx.Timeout(5)
+        pool = http_client._transport._pool  # type: ignore[attr-defined]
+        assert pool._max_connections == 10
+        assert pool._max_keepalive_connections == 10
+        assert pool._keepalive_expiry == 30.0
+
+
+@pytest.mark.oauth
+@pytest.mark.asyncio
+async def test_with_http_client(oauth_client: OAuth2):
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json={"access_token": "ACCESS_TOKEN"})
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        pooled_oauth_client = with_http_client(oauth_client, client)
+
+        await pooled_oauth_client.get_access_token(
+            "CODE", "http://www.tintagel.bt/callback"
+        )
+        await pooled_oauth_client.get_access_token(
+            "CODE", "http://www.tintagel.bt/callback"
+        )
+
+        async with pooled_oauth_client.get_httpx_client() as httpx_client:
+            assert httpx_client is client
+        assert not client.is_closed
+
+        # The original OAuth client is left untouched
+        async with oauth_client.get_httpx_client() as httpx_client:
+            assert httpx_client is not client
+
+    assert [str(request.url) for request in requests] == [
+        "https://www.camelot.bt/access-token",
+        "https://www.camelot.bt/access-token",
+    ]
+
+
+class RefreshOAuth2(BaseOAuth2[dict[str, Any]]):
+    def __init__(self, name: str, rotate_refresh_token: bool = True):
+        super().__init__(
+            "CLIENT_ID",
+            "CLIENT_SECRET",
+            "https://www.camelot.bt/authorize",
+            "https://www.camelot.bt/access-token",
+            "https://www.camelot.bt/refresh",
+            name=name,
+        )
+        self.rotate_refresh_token = rotate_refresh_token
+        self.refreshed: list[str] = []
+
+    async def refresh_token(self, refresh_token: str) -> OAuth2Token:
+        if refresh_token == "INVALID":
+            raise RefreshTokenError("INVALID")
+        self.refreshed.append(refresh_token)
+        token = {"access_token": f"NEW_{refresh_token}", "expires_in": 3600}
+        if self.rotate_refresh_token:
+            token["refresh_token"] = f"NEW_{refresh_token}"
+        return OAuth2Token(token)
+
+
+class UserDatabaseMock(BaseUserDatabase[UserOAuthModel, IDType]):
+    def __init__(self, users: list[UserOAuthModel]):
+        self.users = users
+
+    async def get_expiring_oauth_accounts(
+        self, expires_before: int, after: tuple[int, IDType] | None, limit: int
+    ) -> list[tuple[UserOAuthModel, OAuthAccountModel]]:
+        accounts = sorted(
+            (
+                (user, oauth_account)
+                for user in self.users
+                for oauth_account in user.oauth_accounts
+                if oauth_account.refresh_token is not None
+                and oauth_account.expires_at is not None
+                and oauth_account.expires_at < expires_before
+            ),
+            key=lambda account: (account[1].expires_at, account[1].id),
+        )
+        if after is not None:
+            accounts = [
+                account
+                for account in accounts
+                if (account[1].expires_at, account[1].id) > after
+            ]
+        return accounts[:limit]
+
+    async def update_oauth_account(
+        self,
+        user: UserOAuthModel,
+        oauth_account: OAuthAccountModel,
+        update_dict: dict[str, Any],
+    ) -> UserOAuthModel:
+        if update_dict["access_token"] == "NEW_UNWRITABLE":
+            raise RuntimeError()
+        for key, value in update_dict.items():
+            setattr(oauth_account, key, value)
+        return user
+
+
+def make_account(
+    oauth_name: str, refresh_token: str | None, expires_in: int
+) -> OAuthAccountModel:
+    return OAuthAccountModel(
+        oauth_name=oauth_name,
+        access_token="ACCESS_TOKEN",
+        account_id=str(uuid.uuid4()),
+        account_email="king.arthur@camelot.bt",
+        expires_at=int(time.time()) + expires_in,
+        refresh_token=refresh_token,
+    )
+
+
+def make_refresher(
+    users: list[UserOAuthModel], oauth_clients: list[BaseOAuth2], **kwargs
+) -> tuple[OAuthTokenRefresher, UserDatabaseMock]:
+    user_db = UserDatabaseMock(users)
+
+    @contextlib.asynccontextmanager
+    async def get_database():
+        yield user_db
+
+    return OAuthTokenRefresher(get_database, oauth_clients, **kwargs), user_db
+
+
+def make_user(*oauth_accounts: OAuthAccountModel) -> UserOAuthModel:
+    return UserOAuthModel(
+        email="king.arthur@camelot.bt",
+        hashed_password="HASHED",
+        oauth_accounts=list(oauth_accounts),
+    )
+
+
+@pytest.mark.oauth
+@pytest.mark.asyncio
+class TestOAuthTokenRefresher:
+    async def test_refresh(self):
+        expiring = make_account("service1", "TOKEN1", 60)
+        not_expiring = make_account("service1", "TOKEN2", 3600)
+        no_refresh_token = make_account("service1", None, 60)
+        unknown_provider = make_account("unknown", "TOKEN3", 60)
+        oauth_client = RefreshOAuth2("service1")
+        refresher, _ = make_refresher(
+            [make_user(expiring, not_expiring, no_refresh_token, unknown_provider)],
+            [oauth_client],
+        )
+
+        assert await refresher.refresh() == 1
+
+        assert oauth_client.refreshed == ["TOKEN1"]
+        assert expiring.access_token == "NEW_TOKEN1"
+        assert expiring.refresh_token == "NEW_TOKEN1"
+        assert expiring.expires_at is not None
+        assert expiring.expires_at > time.time() + 3000
+        assert not_expiring.access_token == "ACCESS_TOKEN"
+        assert unknown_provider.access_token == "ACCESS_TOKEN"
+        assert refresher.refreshed_count == 1
+        assert refresher.failed_count == 0
+
+    async def test_keep_refresh_token(self):
+        account = make_account("service1", "TOKEN1", 60)
+        refresher, _ = make_refresher(
+            [make_user(account)],
+            [RefreshOAuth2("service1", rotate_refresh_token=False)],
+        )
+
+        await refresher.refresh()
+
+        assert account.access_token == "NEW_TOKEN1"
+        assert account.refresh_token == "TOKEN1"
+
+    async def test_no_expiring_accounts(self):
+        oauth_client = RefreshOAuth2("service1")
+        refresher, _ = make_refresher(
+            [make_user(make_account("service1", "TOKEN1", 3600))], [oauth_client]
+        )
+
+        assert await refresher.refresh() == 0
+        assert oauth_client.refreshed == []
+
+    @pytest.mark.parametrize("count", [5, 4])
+    async def test_batches(self, count: int, mocker: MockerFixture):
+        accounts = [make_account("service1", f"TOKEN{i}", 60 + i) for i in range(count)]
+        oauth_client = RefreshOAuth2("service1")
+        refresher, user_db = make_refresher(
+            [make_user(*accounts)], [oauth_client], batch_size=2, max_concurrency=1
+        )
+        get_expiring_spy = mocker.spy(user_db, "get_expiring_oauth_accounts")
+
+        assert await refresher.refresh() == count
+
+        assert oauth_client.refreshed == [f"TOKEN{i}" for i in range(count)]
+        # A full last batch needs an extra, empty, fetch to know it was the last
+        assert get_expiring_spy.call_count == 3
+
+    async def test_errors(self):
+        invalid = make_account("service1", "INVALID", 60)
+        unwritable = make_account("service1", "UNWRITABLE", 60)
+        valid = make_account("service1", "TOKEN1", 60)
+        refresher, _ = make_refresher(
+            [make_user(invalid, unwritable, valid)], [RefreshOAuth2("service1")]
+        )
+
+        assert await refresher.refresh() == 1
+
+        assert invalid.access_token == "ACCESS_TOKEN"
+        assert unwritable.access_token == "ACCESS_TOKEN"
+        assert valid.access_token == "NEW_TOKEN1"
+        assert refresher.refreshed_count == 1
+        assert refresher.failed_count == 2
+
+    async def test_rate_limits(self):
+        accounts = [make_account("service1", f"TOKEN{i}", 60) for i in range(3)]
+        refresher, _ = make_refresher(
+            [make_user(*accounts)],
+            [RefreshOAuth2("service1")],
+            rate_limits={"service1": 20},
+        )
+
+        start = time.monotonic()
+        assert await refresher.refresh() == 3
+        assert time.monotonic() - start >= 0.09
+
+    async def test_run_once(self):
+        refresher, _ = make_refresher(
+            [make_user(make_account("service1", "TOKEN1", 60))],
+            [RefreshOAuth2("service1")],
+        )
+        await refresher.run_once()
+
+        assert refresher.refreshed_count == 1
@@ -0,0 +1,283 @@
+import contextlib
+import dataclasses
+import uuid
+from collections.abc import Sequence
+from datetime import datetime, timezone
+from typing import Any
+
+import pytest
+from pytest_mock import MockerFixture
+
+from fastapi_users.jwt import generate_jwt
+from fastapi_users.outbox import OutboxRelay, UserEventType
+from tests.conftest import (
+    IDType,
+    UserCreate,
+    UserManager,
+    UserManagerOAuth,
+    UserModel,
+    UserUpdate,
+)
+
+
+@dataclasses.dataclass
+class UserEvent:
+    type: str
+    user_id: IDType
+    payload: dict[str, Any]
+    id: uuid.UUID = dataclasses.field(default_factory=uuid.uuid4)
+    created_at: datetime = dataclasses.field(
+        default_factory=lambda: datetime.now(timezone.utc)
+    )
+
+
+class OutboxDatabaseMock:
+    def __init__(self):
+        self.events: list[UserEvent] = []
+        self.delivered: list[UserEvent] = []
+
+    async def add(self, create_dict: dict[str, Any]) -> None:
+        self.events.append(UserEvent(**create_dict))
+
+    async def get_pending(self, limit: int) -> list[UserEvent]:
+        return self.events[:limit]
+
+    async def mark_delivered(self, events: Sequence[UserEvent]) -> None:
+        ids = {event.id for event in events}
+        self.delivered.extend(events)
+        self.events = [event for event in self.events if event.id not in ids]
+
+
+class SinkMock:
+    def __init__(self, failures: int = 0):
+        self.failures = failures
+        self.batches: list[list[UserEvent]] = []
+
+    async def send(self, events: Sequence[UserEvent]) -> None:
+        if self.failures > 0:
+            self.failures -= 1
+            raise RuntimeError()
+        self.batches.append(list(events))
+
+
+@pytest.fixture
+def outbox_db() -> OutboxDatabaseMock:
+    return OutboxDatabaseMock()
+
+
+@pytest.fixture
+def get_database(outbox_db: OutboxDatabaseMock):
+    @contextlib.asynccontextmanager
+    async def _get_database():
+        yield outbox_db
+
+    return _get_database
+
+
+async def add_events(outbox_db: OutboxDatabaseMock, count: int) -> None:
+    user_ids = [uuid.uuid4(), uuid.uuid4()]
+    for i in range(count):
+        await outbox_db.add(
+            {
+                "type": UserEventType.UPDATED.value,
+                "user_id": user_ids[i % 2],
+                "payload": {"index": i},
+            }
+        )
+
+
+@pytest.mark.outbox
+@pytest.mark.asyncio
+class TestOutboxRelay:
+    async def test_no_events(self, get_database):
+        sink = SinkMock()
+        relay = OutboxRelay(get_database, sink)
+
+        assert await relay.relay() == 0
+        assert sink.batches == []
+        assert relay.batch_count == 0
+        assert relay.throughput == 0.0
+
+    async def test_batches(self, get_database, outbox_db: OutboxDatabaseMock):
+        await add_events(outbox_db, 5)
+        sink = SinkMock()
+        relay = OutboxRelay(get_database, sink, batch_size=2)
+
+        assert await relay.relay() == 5
+
+        assert [len(batch) for batch in sink.batches] == [2, 2, 1]
+        assert [
+            event.payload["index"] for batch in sink.batches for event in batch
+        ] == list(range(5))
+        assert outbox_db.events == []
+        assert relay.delivered_count == 5
+        assert relay.batch_count == 3
+        assert relay.last_batch_size == 1
+        assert relay.last_batch_duration > 0
+        assert relay.throughput > 0
+
+    async def test_full_last_batch(self, get_database, outbox_db: OutboxDatabaseMock):
+        await add_events(outbox_db, 4)
+        sink = SinkMock()
+        relay = OutboxRelay(get_database, sink, batch_size=2)
+
+        assert await relay.relay() == 4
+        assert [len(batch) for batch in sink.batches] == [2, 2]
+
+    async def test_sink_error(self, get_database, outbox_db: OutboxDatabaseMock):
+        await add_events(outbox_db, 3)
+        sink = SinkMock(failures=1)
+        relay = OutboxRelay(get_database, sink, batch_size=2)
+
+        with pytest.raises(RuntimeError):
+            await relay.run_once()
+        assert len(outbox_db.events) == 3
+        assert relay.delivered_count == 0
+
+        await relay.run_once()
+        assert [
+            event.payload["index"] for batch in sink.batches for event in batch
+        ] == list(range(3))
+        assert outbox_db.events == []
+
+
+@pytest.fixture
+def outbox_user_manager(mock_user_db, outbox_db: OutboxDatabaseMock) -> UserManager:
+    return UserManager(mock_user_db, outbox_db=outbox_db)
+
+
+@pytest.mark.outbox
+@pytest.mark.manager
+@pytest.mark.asyncio
+class TestUserManagerEvents:
+    async def test_no_outbox(self, mock_user_db, outbox_db: OutboxDatabaseMock):
+        user_manager = UserManager(mock_user_db)
+        await user_manager.create(
+            UserCreate(email="lancelot@camelot.bt", password="guinevere")
+        )
+        assert outbox_db.events == []
+
+    async def test_create(
+        self, outbox_user_manager: UserManager, outbox_db: OutboxDatabaseMock
+    ):
+        user = await outbox_user_manager.create(
+            UserCreate(email="lancelot@camelot.bt", password="guinevere")
+        )
+
+        assert len(outbox_db.events) == 1
+        event = outbox_db.events[0]
+        assert event.type == UserEventType.REGISTERED
+        assert event.user_id == user.id
+        assert event.payload == {"email": "lancelot@camelot.bt"}
+
+    async def test_create_outbox_error(
+        self,
+        outbox_user_manager: UserManager,
+        outbox_db: OutboxDatabaseMock,
+        mocker: MockerFixture,
+    ):
+        create_spy = mocker.spy(outbox_user_manager.user_db, "create")
+        on_after_register_spy = mocker.spy(outbox_user_manager, "on_after_register")
+        mocker.patch.object(outbox_db, "add", side_effect=RuntimeError())
+
+        with pytest.raises(RuntimeError):
+            await outbox_user_manager.create(
+                UserCreate(email="lancelot@camelot.bt", password="guinevere")
+            )
+
+        # The user write is not rolled back
+        create_spy.assert_called_once()
+        on_after_register_spy.assert_not_called()
+
+    async def test_oauth_callback(
+        self, mock_user_db_oauth, outbox_db: OutboxDatabaseMock
+    ):
+        user_manager = UserManagerOAuth(mock_user_db_oauth, outbox_db=outbox_db)
+        user = await user_manager.oauth_callback(
+            "service1", "TOKEN", "new_user_oauth1", "galahad@camelot.bt"
+        )
+
+        assert [event.type for event in outbox_db.events] == [UserEventType.REGISTERED]
+        assert outbox_db.events[0].user_id == user.id
+
+    async def test_verify(
+        self,
+        outbox_user_manager: UserManager,
+        outbox_db: OutboxDatabaseMock,
+        user: UserModel,
+    ):
+        token = generate_jwt(
+            {
+                "sub": str(user.id),
+                "email": user.email,
+                "aud": outbox_user_manager.verification_token_audience,
+            },
+            outbox_user_manager.verification_token_secret,
+            3600,
+        )
+        await outbox_user_manager.verify(token)
+
+        assert [event.type for event in outbox_db.events] == [UserEventType.VERIFIED]
+
+    async def test_update(
+        self,
+        outbox_user_manager: UserManager,
+        outbox_db: OutboxDatabaseMock,
+        user: UserModel,
+    ):
+        await outbox_user_manager.update(
+            UserUpdate(first_name="Lancelot", password="excalibur"), user
+        )
+
+        assert len(outbox_db.events) == 1
+        event = outbox_db.events[0]
+        assert event.type == UserEventType.UPDATED
+        assert event.payload == {
+            "email": user.email,
+            "fields": ["first_name", "password"],
+        }
+
+    async def test_update_unchanged(
+        self,
+        outbox_user_manager: UserManager,
+        outbox_db: OutboxDatabaseMock,
+        user: UserModel,
+    ):
+        await outbox_user_manager.update(UserUpdate(email=user.email), user)
+
+        assert outbox_db.events == []
+
+    async def test_reset_password(
+        self,
+        outbox_user_manager: UserManager,
+        outbox_db: OutboxDatabaseMock,
+        user: UserModel,
+    ):
+        token = generate_jwt(
+            {
+                "sub": str(user.id),
+                "password_fgpt": outbox_user_manager.password_helper.hash(
+                    user.hashed_password
+                ),
+                "aud": outbox_user_manager.reset_password_token_audience,
+            },
+            outbox_user_manager.reset_password_token_secret,
+            3600,
+        )
+        await outbox_user_manager.reset_password(token, "excalibur")
+
+        assert len(outbox_db.events) == 1
+        assert outbox_db.events[0].payload["fields"] == ["password"]
+
+    async def test_delete(
+        self,
+        outbox_user_manager: UserManager,
+        outbox_db: OutboxDatabaseMock,
+        user: UserModel,
+    ):
+        await outbox_user_manager.delete(user)
+
+        assert len(outbox_db.events) == 1
+        event = outbox_db.events[0]
+        assert event.type == UserEventType.DELETED
+        assert event.user_id == user.id
@@ -768,3 +768,70 @@ async def test_route_names(
         f"oauth:{oauth_client.name}.{mock_authentication.name}.callback"
     )
     assert test_app.url_path_for(callback_route_name) == "/oauth/callback"
+
+
+@pytest.mark.router
+@pytest.mark.oauth
+@pytest.mark.asyncio
+async def test_http_client(
+    secret,
+    get_user_manager_oauth,
+    mock_authentication,
+    oauth_client: BaseOAuth2,
+    async_method_mocker: AsyncMethodMocker,
+    user_oauth: UserOAuthModel,
+    user_manager_oauth: UserManagerMock,
+    get_test_client,
+):
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json={"access_token": "ACCESS_TOKEN"})
+
+    # Patched before the routers copy the OAuth client
+    async_method_mocker(
+        oauth_client, "get_id_email", return_value=("user_oauth1", user_oauth.email)
+    )
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        authenticator = Authenticator([mock_authentication], get_user_manager_oauth)
+        app = FastAPI()
+        app.include_router(
+            get_oauth_router(
+                oauth_client,
+                mock_authentication,
+                get_user_manager_oauth,
+                secret,
+                http_client=client,
+            ),
+            prefix="/oauth",
+        )
+        app.include_router(
+            get_oauth_associate_router(
+                oauth_client,
+                authenticator,
+                get_user_manager_oauth,
+                User,
+                secret,
+                http_client=client,
+            ),
+            prefix="/oauth-associate",
+        )
+        async_method_mocker(
+            user_manager_oauth, "oauth_callback", return_value=user_oauth
+        )
+
+        state_jwt = generate_state_token({"csrftoken": "CSRFTOKEN"}, JWT_SECRET)
+        async for test_client in get_test_client(app):
+            for _ in range(2):
+                test_client.cookies.set("fastapiusersoauthcsrf", "CSRFTOKEN")
+                response = await test_client.get(
+                    "/oauth/callback",
+                    params={"code": "CODE", "state": state_jwt},
+                )
+                assert response.status_code == status.HTTP_200_OK
+
+        assert len(requests) == 2
+        assert not client.is_closed
+        assert "get_httpx_client" not in vars(oauth_client)
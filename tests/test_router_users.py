@@ -1,3 +1,4 @@
+import json
 from collections.abc import AsyncGenerator
 from typing import Any, cast
 
@@ -13,7 +14,11 @@ from tests.conftest import User, UserModel, UserUpdate, get_mock_authentication
 
 @pytest.fixture
 def app_factory(get_user_manager, mock_authentication):
-    def _app_factory(requires_verification: bool) -> FastAPI:
+    def _app_factory(
+        requires_verification: bool,
+        enable_list: bool = False,
+        enable_export: bool = False,
+    ) -> FastAPI:
         mock_authentication_bis = get_mock_authentication(name="mock-bis")
         authenticator = Authenticator(
             [mock_authentication, mock_authentication_bis], get_user_manager
@@ -25,6 +30,8 @@ def app_factory(get_user_manager, mock_authentication):
             UserUpdate,
             authenticator,
             requires_verification=requires_verification,
+            enable_list=enable_list,
+            enable_export=enable_export,
         )
 
         app = FastAPI()
@@ -48,6 +55,16 @@ async def test_app_client(
         yield client, requires_verification
 
 
+@pytest_asyncio.fixture
+async def admin_app_client(
+    get_test_client, app_factory
+) -> AsyncGenerator[httpx.AsyncClient, None]:
+    app = app_factory(False, enable_list=True, enable_export=True)
+
+    async for client in get_test_client(app):
+        yield client
+
+
 @pytest.mark.router
 @pytest.mark.asyncio
 class TestMe:
@@ -849,10 +866,9 @@ class TestUpdateUser:
             assert response.status_code == status.HTTP_403_FORBIDDEN
         else:
             assert response.status_code == status.HTTP_200_OK
-            assert mock_user_db.update.called is True
-
-            updated_user = mock_user_db.update.call_args[0][0]
-            assert updated_user.hashed_password == current_hashed_password
+            # Nothing changed: the database is not queried
+            assert mock_user_db.update.called is False
+            assert user.hashed_password == current_hashed_password
 
 
 @pytest.mark.router
@@ -959,3 +975,161 @@ class TestDeleteUser:
 
         deleted_user = mock_user_db.delete.call_args[0][0]
         assert deleted_user.id == user.id
+
+
+@pytest.mark.router
+@pytest.mark.asyncio
+class TestListUsers:
+    async def test_disabled(
+        self,
+        test_app_client: tuple[httpx.AsyncClient, bool],
+        verified_superuser: UserModel,
+    ):
+        client, _ = test_app_client
+        response = await client.get(
+            "/", headers={"Authorization": f"Bearer {verified_superuser.id}"}
+        )
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    async def test_missing_token(self, admin_app_client: httpx.AsyncClient):
+        response = await admin_app_client.get("/")
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    async def test_regular_user(
+        self, admin_app_client: httpx.AsyncClient, user: UserModel
+    ):
+        response = await admin_app_client.get(
+            "/", headers={"Authorization": f"Bearer {user.id}"}
+        )
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    async def test_pagination(
+        self,
+        admin_app_client: httpx.AsyncClient,
+        superuser: UserModel,
+        mock_user_db,
+    ):
+        expected_ids = [str(u.id) for u in await mock_user_db.list(None, 100, {})]
+
+        ids: list[str] = []
+        pages = 0
+        params: dict[str, Any] = {"limit": 2}
+        while True:
+            response = await admin_app_client.get(
+                "/", params=params, headers={"Authorization": f"Bearer {superuser.id}"}
+            )
+            assert response.status_code == status.HTTP_200_OK
+            data = cast(dict[str, Any], response.json())
+            ids.extend(item["id"] for item in data["items"])
+            pages += 1
+            if data["next_cursor"] is None:
+                break
+            params["cursor"] = data["next_cursor"]
+
+        assert ids == expected_ids
+        assert pages == 3
+
+    async def test_filters(
+        self,
+        admin_app_client: httpx.AsyncClient,
+        superuser: UserModel,
+        verified_superuser: UserModel,
+    ):
+        response = await admin_app_client.get(
+            "/",
+            params={"is_superuser": True, "is_active": True},
+            headers={"Authorization": f"Bearer {superuser.id}"},
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+        data = cast(dict[str, Any], response.json())
+        assert {item["id"] for item in data["items"]} == {
+            str(superuser.id),
+            str(verified_superuser.id),
+        }
+        assert data["next_cursor"] is None
+
+    @pytest.mark.parametrize("cursor", ["foo", "Zm9v", "_w"])
+    async def test_invalid_cursor(
+        self, admin_app_client: httpx.AsyncClient, superuser: UserModel, cursor: str
+    ):
+        response = await admin_app_client.get(
+            "/",
+            params={"cursor": cursor},
+            headers={"Authorization": f"Bearer {superuser.id}"},
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        data = cast(dict[str, Any], response.json())
+        assert data["detail"] == ErrorCode.LIST_USERS_INVALID_CURSOR
+
+    @pytest.mark.parametrize("limit", [0, 101])
+    async def test_invalid_limit(
+        self, admin_app_client: httpx.AsyncClient, superuser: UserModel, limit: int
+    ):
+        response = await admin_app_client.get(
+            "/",
+            params={"limit": limit},
+            headers={"Authorization": f"Bearer {superuser.id}"},
+        )
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
+
+
+@pytest.mark.router
+@pytest.mark.asyncio
+class TestExportUsers:
+    async def test_disabled(
+        self,
+        test_app_client: tuple[httpx.AsyncClient, bool],
+        verified_superuser: UserModel,
+    ):
+        client, _ = test_app_client
+        response = await client.get(
+            "/export", headers={"Authorization": f"Bearer {verified_superuser.id}"}
+        )
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    async def test_missing_token(self, admin_app_client: httpx.AsyncClient):
+        response = await admin_app_client.get("/export")
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    async def test_regular_user(
+        self, admin_app_client: httpx.AsyncClient, user: UserModel
+    ):
+        response = await admin_app_client.get(
+            "/export", headers={"Authorization": f"Bearer {user.id}"}
+        )
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    async def test_export(
+        self,
+        admin_app_client: httpx.AsyncClient,
+        superuser: UserModel,
+        mock_user_db,
+    ):
+        expected_ids = [str(u.id) for u in await mock_user_db.list(None, 100, {})]
+
+        response = await admin_app_client.get(
+            "/export", headers={"Authorization": f"Bearer {superuser.id}"}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"] == "application/x-ndjson"
+
+        lines = response.text.splitlines()
+        assert [json.loads(line)["id"] for line in lines] == expected_ids
+        assert "hashed_password" not in lines[0]
+
+    async def test_filters(
+        self,
+        admin_app_client: httpx.AsyncClient,
+        superuser: UserModel,
+        inactive_user: UserModel,
+    ):
+        response = await admin_app_client.get(
+            "/export",
+            params={"is_active": False},
+            headers={"Authorization": f"Bearer {superuser.id}"},
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert [json.loads(line)["id"] for line in response.text.splitlines()] == [
+            str(inactive_user.id)
+        ]